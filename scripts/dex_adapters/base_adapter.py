@@ -4,12 +4,49 @@ Base DEX Adapter - Abstract Interface for Multi-DEX Market Making
 Unified interface for Lynex, Nile, SyncSwap, KyberSwap, and Etherex on Linea
 """
 
+import functools
+import json
 from abc import ABC, abstractmethod
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from web3 import Web3
 
 
+# Minimal ERC20 ABI (decimals, symbol, name)
+ERC20_ABI = [
+    {
+        "constant": True,
+        "inputs": [],
+        "name": "decimals",
+        "outputs": [{"name": "", "type": "uint8"}],
+        "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [],
+        "name": "symbol",
+        "outputs": [{"name": "", "type": "string"}],
+        "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [],
+        "name": "name",
+        "outputs": [{"name": "", "type": "string"}],
+        "type": "function"
+    }
+]
+
+ABI_DIR = Path(__file__).parent.parent / "abis"
+
+
+@functools.lru_cache(maxsize=None)
+def load_abi(name: str) -> list:
+    """Parse an ABI from scripts/abis once per process (shared by all adapters)"""
+    return json.loads((ABI_DIR / name).read_text())
+
+
 class SwapEvent:
     """Standardized swap event across all DEX types"""
     def __init__(
@@ -253,30 +290,7 @@ class BaseDEXAdapter(ABC):
 
     def get_token_contract(self, token_address: str):
         """Get ERC20 token contract"""
-        erc20_abi = [
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "decimals",
-                "outputs": [{"name": "", "type": "uint8"}],
-                "type": "function"
-            },
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "symbol",
-                "outputs": [{"name": "", "type": "string"}],
-                "type": "function"
-            },
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "name",
-                "outputs": [{"name": "", "type": "string"}],
-                "type": "function"
-            }
-        ]
-        return self.w3.eth.contract(address=token_address, abi=erc20_abi)
+        return self.w3.eth.contract(address=token_address, abi=ERC20_ABI)
 
     async def get_block_timestamp(self, block_number: Optional[int] = None) -> int:
         """Get timestamp for a block"""
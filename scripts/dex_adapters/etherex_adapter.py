@@ -5,12 +5,10 @@ Top DEX on Linea by users (68K) - LINEA/WETH pool configured
 Pool: ETHEREX-LINEA-WETH-6600 (~2.86M liquidity)
 """
 
-import json
-from pathlib import Path
 from typing import Dict, List, Optional
 from web3 import Web3
 
-from .base_adapter import BaseDEXAdapter, SwapEvent, TickSnapshot
+from .base_adapter import BaseDEXAdapter, SwapEvent, TickSnapshot, load_abi
 
 
 class EtherexAdapter(BaseDEXAdapter):
@@ -36,13 +34,9 @@ class EtherexAdapter(BaseDEXAdapter):
         super().__init__(pool_address, rpc_url, w3)
 
         # Load ABI (Etherex uses V3-compatible ABI)
-        abi_path = Path(__file__).parent.parent / "abis" / "lynex_pool_abi.json"
-        with open(abi_path, 'r') as f:
-            pool_abi = json.load(f)
-
         self.pool_contract = self.w3.eth.contract(
             address=self.pool_address,
-            abi=pool_abi
+            abi=load_abi("lynex_pool_abi.json")
         )
 
         self.tick_spacing = None
@@ -4,12 +4,10 @@ Lynex DEX Adapter - Uniswap V3 Style Concentrated Liquidity
 Primary DEX on Linea for market making
 """
 
-import json
-from pathlib import Path
 from typing import Dict, List, Optional
 from web3 import Web3
 
-from .base_adapter import BaseDEXAdapter, SwapEvent, TickSnapshot
+from .base_adapter import BaseDEXAdapter, SwapEvent, TickSnapshot, load_abi
 
 
 class LynexAdapter(BaseDEXAdapter):
@@ -34,13 +32,9 @@ class LynexAdapter(BaseDEXAdapter):
         super().__init__(pool_address, rpc_url, w3)
 
         # Load ABI
-        abi_path = Path(__file__).parent.parent / "abis" / "lynex_pool_abi.json"
-        with open(abi_path, 'r') as f:
-            pool_abi = json.load(f)
-
         self.pool_contract = self.w3.eth.contract(
             address=self.pool_address,
-            abi=pool_abi
+            abi=load_abi("lynex_pool_abi.json")
         )
 
         self.tick_spacing = None
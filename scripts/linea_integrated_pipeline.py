@@ -7,6 +7,7 @@ Designed for integration with Sapient HRM automated strategy system
 
 import asyncio
 import json
+import logging
 import signal
 import sys
 from pathlib import Path
@@ -159,7 +160,10 @@ class LineaIntegratedPipeline:
 
             # Save snapshots
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            collector.save_snapshots(filename=f"{pair_symbol}_{timestamp}.json")
+            collector.save_snapshots(
+                filename=f"{pair_symbol}_{timestamp}",
+                fmt=self.config.get("collector", {}).get("snapshot_format", "parquet")
+            )
 
     async def run(self, pairs: List[str] = None, duration_seconds: Optional[int] = None):
         """
@@ -315,6 +319,8 @@ async def main():
 
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(message)s", datefmt="%H:%M:%S")
+
     # Parse pairs
     pairs = None
     if args.pairs:
@@ -439,15 +439,15 @@ async def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="Analyze Lynex tick data with Coulter methodology")
-    parser.add_argument("--input", type=str, required=True, help="Input snapshot JSON file")
+    parser.add_argument("--input", type=str, required=True, help="Input snapshot file (.parquet/.msgpack/.ndjson delta stream or legacy .json)")
     parser.add_argument("--output", type=str, help="Output analysis JSON file")
     parser.add_argument("--lookback", type=int, default=20, help="Lookback periods for velocity")
 
     args = parser.parse_args()
 
-    # Load snapshots
-    with open(args.input, 'r') as f:
-        data = json.load(f)
+    # Load snapshots (rebuilds full snapshots from the delta stream)
+    from linea_tick_collector import load_snapshots
+    data = load_snapshots(args.input)
 
     snapshots = data.get("snapshots", [])
     print(f"Loaded {len(snapshots)} snapshots")
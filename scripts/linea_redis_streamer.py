@@ -7,6 +7,7 @@ Integrates with existing Uniswap V3/EtherEx monitor infrastructure
 
 import asyncio
 import json
+import logging
 import time
 from typing import Dict, Optional
 from datetime import datetime
@@ -255,6 +256,8 @@ async def main():
 
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(message)s", datefmt="%H:%M:%S")
+
     streamer = LineaRedisStreamer(
         pool_address=args.pool,
         pair_symbol=args.pair,
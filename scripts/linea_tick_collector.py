@@ -7,6 +7,7 @@ Matches existing Uniswap V3 monitor infrastructure for unified analysis
 
 import asyncio
 import json
+import logging
 import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -18,6 +19,40 @@ from web3.contract import Contract
 from web3.exceptions import BlockNotFound
 import aiohttp
 
+from dex_adapters.base_adapter import ERC20_ABI, load_abi
+
+
+# Multicall3 (same deterministic address on Linea as on other EVM chains)
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
 
 class LynexTickCollector:
     """
@@ -47,20 +82,21 @@ class LynexTickCollector:
         self.tick_range = tick_range
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
 
         # Initialize Web3
         self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
         if not self.w3.is_connected():
             raise ConnectionError(f"Failed to connect to Linea RPC: {self.rpc_url}")
 
-        # Load pool contract ABI
-        abi_path = Path(__file__).parent / "abis" / "lynex_pool_abi.json"
-        with open(abi_path, 'r') as f:
-            pool_abi = json.load(f)
-
+        # Load pool contract ABI (cached across instances)
         self.pool_contract = self.w3.eth.contract(
             address=self.pool_address,
-            abi=pool_abi
+            abi=load_abi("lynex_pool_abi.json")
+        )
+        self.multicall_contract = self.w3.eth.contract(
+            address=MULTICALL3_ADDRESS,
+            abi=MULTICALL3_ABI
         )
 
         # Pool metadata
@@ -74,44 +110,32 @@ class LynexTickCollector:
         # State tracking
         self.last_block = None
         self.last_tick = None
+        self.last_liquidity = None
         self.snapshots = []
 
     async def initialize(self):
         """Initialize pool metadata and token information"""
         print(f"Initializing Lynex pool: {self.pool_address}")
 
-        # Get pool metadata
-        self.token0 = self.pool_contract.functions.token0().call()
-        self.token1 = self.pool_contract.functions.token1().call()
-        self.fee = self.pool_contract.functions.fee().call()
-        self.tick_spacing = self.pool_contract.functions.tickSpacing().call()
-
-        # Get token decimals (using ERC20 ABI)
-        erc20_abi = [
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "decimals",
-                "outputs": [{"name": "", "type": "uint8"}],
-                "type": "function"
-            },
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "symbol",
-                "outputs": [{"name": "", "type": "string"}],
-                "type": "function"
-            }
-        ]
-
-        token0_contract = self.w3.eth.contract(address=self.token0, abi=erc20_abi)
-        token1_contract = self.w3.eth.contract(address=self.token1, abi=erc20_abi)
-
-        self.decimals0 = token0_contract.functions.decimals().call()
-        self.decimals1 = token1_contract.functions.decimals().call()
-
-        symbol0 = token0_contract.functions.symbol().call()
-        symbol1 = token1_contract.functions.symbol().call()
+        # Get pool metadata (one round trip)
+        pool = self.pool_contract.functions
+        self.token0, self.token1, self.fee, self.tick_spacing = self.multicall([
+            pool.token0(),
+            pool.token1(),
+            pool.fee(),
+            pool.tickSpacing()
+        ])
+
+        # Get token decimals + symbols (using ERC20 ABI), second round trip
+        # since the token addresses come from the first one
+        token0 = self.w3.eth.contract(address=self.token0, abi=ERC20_ABI).functions
+        token1 = self.w3.eth.contract(address=self.token1, abi=ERC20_ABI).functions
+        self.decimals0, symbol0, self.decimals1, symbol1 = self.multicall([
+            token0.decimals(),
+            token0.symbol(),
+            token1.decimals(),
+            token1.symbol()
+        ])
 
         print(f"  Pool: {symbol0}/{symbol1}")
         print(f"  Fee: {self.fee / 10000}%")
@@ -119,6 +143,34 @@ class LynexTickCollector:
         print(f"  Token0: {self.token0} (decimals: {self.decimals0})")
         print(f"  Token1: {self.token1} (decimals: {self.decimals1})")
 
+    def multicall(self, calls: List, allow_failure: bool = False) -> List:
+        """
+        Batch view calls into a single Multicall3 aggregate3 eth_call
+
+        Args:
+            calls: Bound contract functions, e.g. pool.functions.fee()
+            allow_failure: Return None for reverted calls instead of raising
+
+        Returns:
+            Decoded return values in call order
+        """
+        payload = [
+            (call.address, allow_failure, call._encode_transaction_data())
+            for call in calls
+        ]
+        results = self.multicall_contract.functions.aggregate3(payload).call()
+
+        decoded = []
+        for call, (success, return_data) in zip(calls, results):
+            if not success:
+                decoded.append(None)
+                continue
+            output_types = [output["type"] for output in call.abi["outputs"]]
+            values = self.w3.codec.decode(output_types, return_data)
+            decoded.append(values[0] if len(values) == 1 else values)
+
+        return decoded
+
     def get_slot0(self) -> Dict:
         """Get current pool state (slot0)"""
         slot0 = self.pool_contract.functions.slot0().call()
@@ -212,6 +264,71 @@ class LynexTickCollector:
 
         return tick_liquidity
 
+    def build_header(self) -> Dict:
+        """Static pool metadata, written once at the start of the delta stream"""
+        return {
+            "type": "header",
+            "pool": self.pool_address,
+            "token0": self.token0,
+            "token1": self.token1,
+            "tick_spacing": self.tick_spacing,
+            "fee": self.fee,
+            "decimals0": self.decimals0,
+            "decimals1": self.decimals1
+        }
+
+    def build_delta(
+        self,
+        snapshot: Dict,
+        prev_tick_map: Dict[int, Tuple[int, int]]
+    ) -> Tuple[Dict, Dict[int, Tuple[int, int]]]:
+        """
+        Build a block's delta record against the previous block's tick map
+        Follows the Uniswap V3 update model: Mint adds liquidityGross/liquidityNet
+        at its bounds, Burn subtracts them, Swap only moves tick/price (no dticks)
+
+        Returns:
+            (delta record, this block's tick map to diff the next block against)
+        """
+        tick_map = {
+            int(tick): (int(data["liquidityGross"]), int(data["liquidityNet"]))
+            for tick, data in snapshot["tick_liquidity"].items()
+        }
+
+        dticks = []
+        for tick, (gross, net) in tick_map.items():
+            prev_gross, prev_net = prev_tick_map.get(tick, (0, 0))
+            if gross != prev_gross or net != prev_net:
+                dticks.append([tick, str(gross - prev_gross), str(net - prev_net)])
+
+        # Ticks that were burned or left the monitored range
+        for tick, (prev_gross, prev_net) in prev_tick_map.items():
+            if tick not in tick_map:
+                dticks.append([tick, str(-prev_gross), str(-prev_net)])
+
+        record = {
+            "type": "delta",
+            "block": snapshot["block"],
+            "timestamp": snapshot["timestamp"],
+            "tick": snapshot["current_tick"],
+            "price": snapshot["price"],
+            "sqrt": snapshot["sqrtPriceX96"],
+            "liquidity": snapshot["liquidity"],
+            "dticks": dticks
+        }
+        return record, tick_map
+
+    def iter_records(self):
+        """
+        Delta stream of the collected snapshots: header, then one delta per block
+        Built on demand at save time, so collection only holds self.snapshots
+        """
+        yield self.build_header()
+        prev_tick_map = {}
+        for snapshot in self.snapshots:
+            record, prev_tick_map = self.build_delta(snapshot, prev_tick_map)
+            yield record
+
     async def capture_snapshot(self) -> Dict:
         """
         Capture complete orderbook snapshot at current block
@@ -264,6 +381,7 @@ class LynexTickCollector:
 
         self.last_tick = current_tick
         self.last_block = block
+        self.last_liquidity = liquidity
         self.snapshots.append(snapshot)
 
         return snapshot
@@ -294,13 +412,15 @@ class LynexTickCollector:
                 snapshot = await self.capture_snapshot()
                 snapshot_count += 1
 
-                # Log progress
-                print(f"[{datetime.fromtimestamp(snapshot['timestamp']).strftime('%H:%M:%S')}] "
-                      f"Block {snapshot['block']} | "
-                      f"Tick: {snapshot['current_tick']} | "
-                      f"Price: {snapshot['price']:.6f} | "
-                      f"Liquidity: {int(snapshot['liquidity']):,} | "
-                      f"Active Ticks: {len(snapshot['tick_liquidity'])}")
+                # Log progress (formatting deferred until the record is emitted)
+                self.logger.info(
+                    "Block %d | Tick: %d | Price: %.6f | Liquidity: %d | Active Ticks: %d",
+                    snapshot["block"],
+                    snapshot["current_tick"],
+                    snapshot["price"],
+                    self.last_liquidity,
+                    len(snapshot["tick_liquidity"])
+                )
 
                 # Execute callback (for Redis streaming)
                 if callback:
@@ -315,35 +435,220 @@ class LynexTickCollector:
             print(f"\nCollected {snapshot_count} snapshots over {time.time() - start_time:.1f}s")
             return self.snapshots
 
-    def save_snapshots(self, filename: str = None):
-        """Save collected snapshots to JSON file"""
+    def save_snapshots(self, filename: str = None, fmt: str = "parquet"):
+        """
+        Save the collected delta stream (header record + one delta per block)
+
+        Args:
+            filename: Output filename; its extension is always set from fmt
+                (e.g. foo.json with fmt="parquet" is saved as foo.parquet)
+            fmt: "parquet" (columnar, zstd), "msgpack" or "ndjson"
+        """
+        if fmt not in SNAPSHOT_FORMATS:
+            raise ValueError(f"Unknown snapshot format: {fmt}")
+
         if not self.snapshots:
             print("No snapshots to save")
             return None
 
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"lynex_ticks_{self.pool_address[:8]}_{timestamp}.json"
+            filename = f"lynex_ticks_{self.pool_address[:8]}_{timestamp}"
 
+        # load_snapshots picks the reader from the extension, so it must match fmt
         filepath = self.data_dir / filename
+        if filepath.suffix != SNAPSHOT_FORMATS[fmt]:
+            filepath = filepath.with_suffix(SNAPSHOT_FORMATS[fmt])
+
+        if fmt == "parquet":
+            _write_parquet(filepath, list(self.iter_records()))
+        elif fmt == "msgpack":
+            import msgpack
+            with open(filepath, 'wb') as f:
+                for record in self.iter_records():
+                    f.write(msgpack.packb(record))
+        else:
+            with open(filepath, 'w') as f:
+                for record in self.iter_records():
+                    f.write(json.dumps(record, separators=(',', ':')))
+                    f.write('\n')
 
-        data = {
-            "pool": self.pool_address,
-            "token0": self.token0,
-            "token1": self.token1,
-            "tick_spacing": self.tick_spacing,
-            "fee": self.fee,
-            "collection_start": self.snapshots[0]["timestamp"],
-            "collection_end": self.snapshots[-1]["timestamp"],
-            "snapshot_count": len(self.snapshots),
-            "snapshots": self.snapshots
+        print(f"✓ Saved {len(self.snapshots)} snapshots to {filepath}")
+        return filepath
+
+
+# On-disk snapshot formats and their file extensions
+SNAPSHOT_FORMATS = {
+    "parquet": ".parquet",
+    "msgpack": ".msgpack",
+    "ndjson": ".ndjson"
+}
+
+
+def _int_to_bytes(value: int) -> bytes:
+    """Minimal two's-complement encoding for uint160/int128 values"""
+    return value.to_bytes((value.bit_length() + 8) // 8, "big", signed=True)
+
+
+def _bytes_to_int(data: bytes) -> int:
+    return int.from_bytes(data, "big", signed=True)
+
+
+def _write_parquet(filepath: Path, records: List[Dict]):
+    """
+    Write the delta stream as one Parquet row per block
+    Header metadata goes in the schema metadata; big ints are stored as binary
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    header, deltas = records[0], records[1:]
+
+    schema = pa.schema(
+        [
+            ("block", pa.int64()),
+            ("timestamp", pa.int64()),
+            ("tick", pa.int32()),
+            ("price", pa.float64()),
+            ("sqrt", pa.binary()),
+            ("liquidity", pa.binary()),
+            ("dtick", pa.list_(pa.int32())),
+            ("dgross", pa.list_(pa.binary())),
+            ("dnet", pa.list_(pa.binary()))
+        ],
+        metadata={"header": json.dumps(header)}
+    )
+
+    columns = {
+        "block": [d["block"] for d in deltas],
+        "timestamp": [d["timestamp"] for d in deltas],
+        "tick": [d["tick"] for d in deltas],
+        "price": [d["price"] for d in deltas],
+        "sqrt": [_int_to_bytes(int(d["sqrt"])) for d in deltas],
+        "liquidity": [_int_to_bytes(int(d["liquidity"])) for d in deltas],
+        "dtick": [[t for t, _, _ in d["dticks"]] for d in deltas],
+        "dgross": [[_int_to_bytes(int(g)) for _, g, _ in d["dticks"]] for d in deltas],
+        "dnet": [[_int_to_bytes(int(n)) for _, _, n in d["dticks"]] for d in deltas]
+    }
+
+    table = pa.Table.from_pydict(columns, schema=schema)
+    pq.write_table(table, filepath, compression="zstd")
+
+
+def _read_records(filepath: Path) -> List[Dict]:
+    """Read a saved delta stream back into header + delta records"""
+    if filepath.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(filepath)
+        header = json.loads(table.schema.metadata[b"header"])
+        records = [header]
+        for row in table.to_pylist():
+            records.append({
+                "type": "delta",
+                "block": row["block"],
+                "timestamp": row["timestamp"],
+                "tick": row["tick"],
+                "price": row["price"],
+                "sqrt": str(_bytes_to_int(row["sqrt"])),
+                "liquidity": str(_bytes_to_int(row["liquidity"])),
+                "dticks": [
+                    [t, str(_bytes_to_int(g)), str(_bytes_to_int(n))]
+                    for t, g, n in zip(row["dtick"], row["dgross"], row["dnet"])
+                ]
+            })
+        return records
+
+    if filepath.suffix == ".msgpack":
+        import msgpack
+
+        with open(filepath, 'rb') as f:
+            return list(msgpack.Unpacker(f, raw=False))
+
+    with open(filepath, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_snapshots(filepath: str) -> Dict:
+    """
+    Rebuild full snapshots from a saved delta stream (.parquet, .msgpack, .ndjson)
+    Legacy .json files (full snapshots) are returned unchanged
+
+    Returns:
+        Dictionary with pool metadata and the reconstructed "snapshots" list
+    """
+    filepath = Path(filepath)
+
+    if filepath.suffix == ".json":
+        with open(filepath, 'r') as f:
+            return json.load(f)
+
+    records = _read_records(filepath)
+
+    header = records[0]
+    decimal_adjustment = 10 ** (header["decimals0"] - header["decimals1"])
+    metadata = {
+        "tick_spacing": header["tick_spacing"],
+        "fee": header["fee"],
+        "decimals0": header["decimals0"],
+        "decimals1": header["decimals1"]
+    }
+
+    tick_map = {}
+    last_tick = None
+    snapshots = []
+
+    for record in records[1:]:
+        # Apply Mint/Burn deltas; ticks with no gross liquidity left are dropped
+        for tick, dgross, dnet in record["dticks"]:
+            gross, net = tick_map.get(tick, (0, 0))
+            gross += int(dgross)
+            net += int(dnet)
+            if gross == 0:
+                tick_map.pop(tick, None)
+            else:
+                tick_map[tick] = (gross, net)
+
+        current_tick = record["tick"]
+        snapshot = {
+            "timestamp": record["timestamp"],
+            "block": record["block"],
+            "pool": header["pool"],
+            "token0": header["token0"],
+            "token1": header["token1"],
+            "current_tick": current_tick,
+            "sqrtPriceX96": record["sqrt"],
+            "price": record["price"],
+            "liquidity": record["liquidity"],
+            "tick_liquidity": {
+                str(tick): {
+                    "liquidityGross": str(gross),
+                    "liquidityNet": str(net),
+                    "price": (1.0001 ** tick) * decimal_adjustment,
+                    "initialized": True
+                }
+                for tick, (gross, net) in sorted(tick_map.items())
+            },
+            "metadata": metadata
         }
 
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        if last_tick is not None and current_tick != last_tick:
+            snapshot["tick_change"] = current_tick - last_tick
+        last_tick = current_tick
 
-        print(f"✓ Saved {len(self.snapshots)} snapshots to {filepath}")
-        return filepath
+        snapshots.append(snapshot)
+
+    return {
+        "pool": header["pool"],
+        "token0": header["token0"],
+        "token1": header["token1"],
+        "tick_spacing": header["tick_spacing"],
+        "fee": header["fee"],
+        "collection_start": snapshots[0]["timestamp"] if snapshots else None,
+        "collection_end": snapshots[-1]["timestamp"] if snapshots else None,
+        "snapshot_count": len(snapshots),
+        "snapshots": snapshots
+    }
 
 
 async def main():
@@ -356,10 +661,14 @@ async def main():
     parser.add_argument("--duration", type=int, default=600, help="Collection duration in seconds (default: 600)")
     parser.add_argument("--tick-range", type=int, default=200, help="Ticks to monitor around current price (default: 200)")
     parser.add_argument("--output", type=str, help="Output filename")
+    parser.add_argument("--format", type=str, default="parquet", choices=list(SNAPSHOT_FORMATS),
+                        help="Snapshot file format (default: parquet)")
     parser.add_argument("--data-dir", type=str, default="data/ticks", help="Data directory")
 
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(message)s", datefmt="%H:%M:%S")
+
     # Initialize collector
     collector = LynexTickCollector(
         pool_address=args.pool,
@@ -372,7 +681,7 @@ async def main():
     snapshots = await collector.stream_ticks(duration_seconds=args.duration)
 
     # Save results
-    collector.save_snapshots(filename=args.output)
+    collector.save_snapshots(filename=args.output, fmt=args.format)
 
     print("\n✓ Tick collection complete")
 
@@ -0,0 +1,93 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Ahead-of-time compiled versions of the _kernels reductions
+
+Same names and results as mm_analytics._kernels; picked up automatically when
+built (see setup_kernels.py), so there is no JIT warm-up at import.
+Inputs must be C-contiguous float32 or float64 arrays (ring-buffer slices
+are); sums are accumulated in double.
+"""
+
+from libc.math cimport sqrt
+
+ctypedef fused real:
+    float
+    double
+
+# Relative floor for centered sums of squares (treat the series as constant);
+# must equal mm_analytics._kernels.REL_VARIANCE_EPS (not imported: _kernels
+# imports this module)
+cdef double _REL_VARIANCE_EPS = 1e-12
+
+
+cdef struct Accum:
+    double sx
+    double sy
+    double sxx
+    double syy
+    double sxy
+    Py_ssize_t n
+
+
+cdef Accum _accumulate(const real[::1] y, const real[::1] x, Py_ssize_t n) noexcept nogil:
+    """Σx, Σy, Σx², Σy², Σxy over the first n pairs"""
+    cdef Accum acc
+    cdef Py_ssize_t i
+    cdef double xi, yi
+    acc.sx = 0.0
+    acc.sy = 0.0
+    acc.sxx = 0.0
+    acc.syy = 0.0
+    acc.sxy = 0.0
+    acc.n = n
+    for i in range(n):
+        xi = x[i]
+        yi = y[i]
+        acc.sx += xi
+        acc.sy += yi
+        acc.sxx += xi * xi
+        acc.syy += yi * yi
+        acc.sxy += xi * yi
+    return acc
+
+
+cpdef tuple ar1_sums(const real[::1] x):
+    """Σx, Σx² and Σ x_t·x_{t-1} in one pass"""
+    cdef Py_ssize_t i, n = x.shape[0]
+    cdef double s1 = 0.0, s2 = 0.0, sxy = 0.0, prev = 0.0, xi
+    with nogil:
+        for i in range(n):
+            xi = x[i]
+            s1 += xi
+            s2 += xi * xi
+            if i > 0:
+                sxy += xi * prev
+            prev = xi
+    return s1, s2, sxy
+
+
+cpdef tuple ols_sums(const double[::1] y, const double[::1] x):
+    """Σx, Σy, Σx², Σy², Σxy in one pass"""
+    cdef Accum acc
+    with nogil:
+        acc = _accumulate(y, x, y.shape[0])
+    return acc.sx, acc.sy, acc.sxx, acc.syy, acc.sxy
+
+
+cpdef double lag_autocorr(const real[::1] x, Py_ssize_t lag):
+    """Pearson correlation of x[lag:] with x[:-lag] (0.0 for a constant series)"""
+    cdef Py_ssize_t n = x.shape[0] - lag
+    cdef Accum acc
+    cdef double var_a, var_b
+    if n < 2:
+        return 0.0
+
+    with nogil:
+        acc = _accumulate(x[lag:], x, n)
+
+    var_a = acc.syy - acc.sy * acc.sy / n
+    var_b = acc.sxx - acc.sx * acc.sx / n
+    if var_a <= _REL_VARIANCE_EPS * acc.syy or var_b <= _REL_VARIANCE_EPS * acc.sxx:
+        return 0.0
+
+    return (acc.sxy - acc.sy * acc.sx / n) / sqrt(var_a * var_b)
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Numeric kernels shared by the orderflow, Kyle's lambda and volatility estimators
+
+Single-pass, loop-style reductions over raw float arrays (float32 or float64
+input; accumulation is always float64):
+- ar1_sums: Σx, Σx², Σx_t·x_{t-1} (AR(1) accumulators)
+- ols_sums: Σx, Σy, Σx², Σy², Σxy (OLS accumulators)
+- lag_autocorr: lag-k Pearson autocorrelation
+- ohlc_vol_stats: realized / Parkinson / Garman-Klass sums fused in one pass
+- yang_zhang_moments: overnight variance and mean Rogers-Satchell term
+  (both un-annualized; invalid candles are skipped)
+- bucket_ends: where each VPIN volume bucket closes in a run of trades
+- summary_stats: mean, population std, min and max in one pass
+
+Resolution order for the exported names:
+1. the Cython extension _ckernels, if built (setup_kernels.py)
+2. numba-compiled loops (signatures are given so compilation happens at import)
+3. equivalent single-pass NumPy expressions (dot products, no covariance matrices)
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from . import _ckernels
+except ImportError:  # extension not built
+    _ckernels = None
+
+try:
+    if _ckernels is not None:
+        raise ImportError("AOT kernels built; skip JIT compilation")
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+
+# Relative floor for centered sums of squares (treat the series as constant);
+# the one degenerate-variance test for every estimator in the package
+REL_VARIANCE_EPS = 1e-12
+
+# Garman-Klass weight on the squared open-to-close log return: 2·ln(2) - 1
+_GK_CO_WEIGHT = 2.0 * math.log(2.0) - 1.0
+
+
+@njit(["UniTuple(float64, 3)(float64[:])", "UniTuple(float64, 3)(float32[:])"],
+      cache=True, fastmath=True)
+def ar1_sums(x):
+    """Σx, Σx² and Σ x_t·x_{t-1} in one pass"""
+    s1 = 0.0
+    s2 = 0.0
+    sxy = 0.0
+    prev = 0.0
+    for i in range(x.shape[0]):
+        xi = np.float64(x[i])
+        s1 += xi
+        s2 += xi * xi
+        if i > 0:
+            sxy += xi * prev
+        prev = xi
+    return s1, s2, sxy
+
+
+@njit("UniTuple(float64, 5)(float64[:], float64[:])", cache=True, fastmath=True)
+def ols_sums(y, x):
+    """Σx, Σy, Σx², Σy², Σxy in one pass"""
+    sx = 0.0
+    sy = 0.0
+    sxx = 0.0
+    syy = 0.0
+    sxy = 0.0
+    for i in range(y.shape[0]):
+        xi = x[i]
+        yi = y[i]
+        sx += xi
+        sy += yi
+        sxx += xi * xi
+        syy += yi * yi
+        sxy += xi * yi
+    return sx, sy, sxx, syy, sxy
+
+
+@njit(["float64(float64[:], int64)", "float64(float32[:], int64)"], cache=True, fastmath=True)
+def lag_autocorr(x, lag):
+    """Pearson correlation of x[lag:] with x[:-lag] (0.0 for a constant series)"""
+    n = x.shape[0] - lag
+    if n < 2:
+        return 0.0
+
+    sa = 0.0
+    sb = 0.0
+    saa = 0.0
+    sbb = 0.0
+    sab = 0.0
+    for i in range(n):
+        a = np.float64(x[i + lag])
+        b = np.float64(x[i])
+        sa += a
+        sb += b
+        saa += a * a
+        sbb += b * b
+        sab += a * b
+
+    var_a = saa - sa * sa / n
+    var_b = sbb - sb * sb / n
+    if var_a <= REL_VARIANCE_EPS * saa or var_b <= REL_VARIANCE_EPS * sbb:
+        return 0.0
+
+    return (sab - sa * sb / n) / math.sqrt(var_a * var_b)
+
+
+@njit("Tuple((float64, float64, int64, float64, int64, float64, int64))"
+      "(float64[:], float64[:], float64[:], float64[:])", cache=True, fastmath=True)
+def ohlc_vol_stats(o, h, l, c):
+    """
+    Realized, Parkinson and Garman-Klass statistics in one pass over OHLC
+
+    Each log is taken once per candle: ln(C_t/C_{t-1}) feeds the realized sums,
+    ln(H/L) both Parkinson and Garman-Klass, ln(C/O) Garman-Klass.
+
+    Returns:
+        (Σr, Σr², return count, Σ ln(H/L)², Parkinson count,
+         Σ Garman-Klass terms, Garman-Klass count)
+    """
+    rv_sum = 0.0
+    rv_sq_sum = 0.0
+    rv_n = 0
+    park_sum = 0.0
+    park_n = 0
+    gk_sum = 0.0
+    gk_n = 0
+    prev = 0.0
+    for i in range(o.shape[0]):
+        op = o[i]
+        hi = h[i]
+        lo = l[i]
+        cl = c[i]
+
+        if i > 0 and prev > 0 and cl > 0:
+            r = math.log(cl / prev)
+            rv_sum += r
+            rv_sq_sum += r * r
+            rv_n += 1
+        prev = cl
+
+        if hi > 0 and lo > 0 and hi >= lo:
+            hl = math.log(hi / lo)
+            hl_sq = hl * hl
+            park_sum += hl_sq
+            park_n += 1
+            if op > 0 and cl > 0:
+                co = math.log(cl / op)
+                gk_sum += 0.5 * hl_sq - _GK_CO_WEIGHT * co * co
+                gk_n += 1
+
+    return rv_sum, rv_sq_sum, rv_n, park_sum, park_n, gk_sum, gk_n
+
+
+@njit("Tuple((float64, float64, int64))(float64[:], float64[:], float64[:], float64[:])",
+      cache=True, fastmath=True)
+def yang_zhang_moments(o, h, l, c):
+    """
+    Overnight-return sample variance (ddof=1), mean Rogers-Satchell term and
+    the number of valid (previous close, candle) pairs
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    rs_sum = 0.0
+    for i in range(1, o.shape[0]):
+        pc = c[i - 1]
+        op = o[i]
+        hi = h[i]
+        lo = l[i]
+        cl = c[i]
+        if pc > 0 and op > 0 and hi > 0 and lo > 0 and cl > 0:
+            r = math.log(op / pc)
+            n += 1
+            d = r - mean
+            mean += d / n
+            m2 += d * (r - mean)
+            rs_sum += (math.log(hi / cl) * math.log(hi / op) +
+                       math.log(lo / cl) * math.log(lo / op))
+    if n < 2:
+        return 0.0, 0.0, n
+    return m2 / (n - 1), rs_sum / n, n
+
+
+# No fastmath: the running total must be summed in trade order, exactly as
+# VPINCalculator.add_trade does, so buckets close on the same trades
+@njit("Tuple((int64[:], float64[:], float64))(float64[:], float64, float64)", cache=True)
+def bucket_ends(volumes, open_total, bucket_size):
+    """
+    Indices of the trades that close a volume bucket, and each bucket's total
+
+    A bucket closes on the first trade that brings its total to bucket_size
+    or more (that trade stays in it); the next bucket starts from zero.
+
+    Args:
+        volumes: Trade volumes, oldest first
+        open_total: Volume already in the open bucket
+        bucket_size: Volume per bucket
+
+    Returns:
+        (closing trade indices, bucket totals, volume left in the open bucket)
+    """
+    n = volumes.shape[0]
+    ends = np.empty(n, dtype=np.int64)
+    totals = np.empty(n, dtype=np.float64)
+    k = 0
+    running = open_total
+    for i in range(n):
+        running += volumes[i]
+        if running >= bucket_size:
+            ends[k] = i
+            totals[k] = running
+            k += 1
+            running = 0.0
+    return ends[:k], totals[:k], running
+
+
+@njit("UniTuple(float64, 4)(float64[:])", cache=True, fastmath=True)
+def summary_stats(x):
+    """
+    Mean, population standard deviation (ddof=0), min and max of a
+    non-empty array in one pass (Welford update for the variance)
+    """
+    mean = 0.0
+    m2 = 0.0
+    lo = x[0]
+    hi = x[0]
+    for i in range(x.shape[0]):
+        xi = x[i]
+        d = xi - mean
+        mean += d / (i + 1)
+        m2 += d * (xi - mean)
+        if xi < lo:
+            lo = xi
+        if xi > hi:
+            hi = xi
+    return mean, math.sqrt(m2 / x.shape[0]), lo, hi
+
+
+def _cov_scalar(a: np.ndarray, b: np.ndarray) -> float:
+    """Population covariance of two equal-length arrays via one dot product"""
+    return float(a @ b) / a.size - float(a.mean()) * float(b.mean())
+
+
+def _pearson_scalar(a: np.ndarray, b: np.ndarray) -> float:
+    """Pearson correlation without building a 2x2 matrix (0.0 for a constant series)"""
+    n = a.size
+    ma = float(a.mean())
+    mb = float(b.mean())
+    saa = float(a @ a)
+    sbb = float(b @ b)
+    var_a = saa - n * ma * ma
+    var_b = sbb - n * mb * mb
+    if var_a <= REL_VARIANCE_EPS * saa or var_b <= REL_VARIANCE_EPS * sbb:
+        return 0.0
+    return _cov_scalar(a, b) * n / math.sqrt(var_a * var_b)
+
+
+def _ar1_sums_np(x):
+    x = x.astype(np.float64, copy=False)
+    return float(x.sum()), float(x @ x), float(x[1:] @ x[:-1])
+
+
+def _ols_sums_np(y, x):
+    return float(x.sum()), float(y.sum()), float(x @ x), float(y @ y), float(x @ y)
+
+
+def _lag_autocorr_np(x, lag):
+    n = x.shape[0] - lag
+    if n < 2:
+        return 0.0
+    x = x.astype(np.float64, copy=False)
+    return _pearson_scalar(x[lag:], x[:n])
+
+
+def _ohlc_vol_stats_np(o, h, l, c):
+    prev = c[:-1]
+    curr = c[1:]
+    valid = (prev > 0) & (curr > 0)
+    r = np.log(curr[valid] / prev[valid])
+
+    park_valid = (h > 0) & (l > 0) & (h >= l)
+    hl = np.log(h[park_valid] / l[park_valid])
+    hl_sq = hl * hl
+
+    gk_valid = (o[park_valid] > 0) & (c[park_valid] > 0)
+    co = np.log(c[park_valid][gk_valid] / o[park_valid][gk_valid])
+    gk_sum = 0.5 * float(hl_sq[gk_valid].sum()) - _GK_CO_WEIGHT * float(co @ co)
+
+    return (float(r.sum()), float(r @ r), r.shape[0],
+            float(hl_sq.sum()), hl.shape[0], gk_sum, co.shape[0])
+
+
+def _yang_zhang_moments_np(o, h, l, c):
+    pc = c[:-1]
+    op = o[1:]
+    hi = h[1:]
+    lo = l[1:]
+    cl = c[1:]
+    valid = (pc > 0) & (op > 0) & (hi > 0) & (lo > 0) & (cl > 0)
+    pc, op, hi, lo, cl = pc[valid], op[valid], hi[valid], lo[valid], cl[valid]
+    n = pc.shape[0]
+    if n < 2:
+        return 0.0, 0.0, n
+    overnight = np.log(op / pc)
+    dev = overnight - float(overnight.sum()) / n
+    rs = np.log(hi / cl) * np.log(hi / op) + np.log(lo / cl) * np.log(lo / op)
+    return float(dev @ dev) / (n - 1), float(rs.sum()) / n, n
+
+
+def _summary_stats_np(x):
+    mean = float(x.sum()) / x.shape[0]
+    dev = x - mean
+    return mean, math.sqrt(float(dev @ dev) / x.shape[0]), float(x.min()), float(x.max())
+
+
+def _bucket_ends_np(volumes, open_total, bucket_size):
+    # Per bucket: running total over a growing chunk of the remaining trades
+    # (sorted, as volumes are non-negative), then searchsorted for the close
+    n = volumes.shape[0]
+    ends = []
+    totals = []
+    start = 0
+    chunk = 64
+    while start < n:
+        stop = min(start + chunk, n)
+        running = volumes[start:stop].copy()
+        running[0] += open_total
+        np.cumsum(running, out=running)
+        j = int(np.searchsorted(running, bucket_size))
+
+        if j == running.shape[0]:
+            if stop < n:
+                # Bucket doesn't close inside this chunk; look further ahead
+                chunk *= 2
+                continue
+            open_total = float(running[-1])
+            break
+
+        ends.append(start + j)
+        totals.append(float(running[j]))
+        open_total = 0.0
+        start += j + 1
+        chunk = max(64, 2 * (j + 1))
+
+    return np.array(ends, dtype=np.int64), np.array(totals, dtype=np.float64), open_total
+
+
+if not HAVE_NUMBA:
+    # Python loops are slower than vectorized NumPy; use the NumPy forms
+    ar1_sums = _ar1_sums_np
+    ols_sums = _ols_sums_np
+    lag_autocorr = _lag_autocorr_np
+    ohlc_vol_stats = _ohlc_vol_stats_np
+    yang_zhang_moments = _yang_zhang_moments_np
+    bucket_ends = _bucket_ends_np
+    summary_stats = _summary_stats_np
+
+if _ckernels is not None:
+    ar1_sums = _ckernels.ar1_sums
+    ols_sums = _ckernels.ols_sums
+    lag_autocorr = _ckernels.lag_autocorr
@@ -16,10 +16,31 @@ References:
 import numpy as np
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from bisect import bisect_left, bisect_right
 import math
 
+from ._kernels import REL_VARIANCE_EPS, ols_sums
 
-@dataclass
+
+# Trade sides: pass these ints to add_trade / add_trades_bulk to skip string
+# handling; "buy"/"sell" strings are still accepted
+BUY = 1
+SELL = -1
+_SIDE_MAP = {"buy": BUY, "sell": SELL}
+
+# Inventory urgency: |ratio| strictly above each threshold steps up one level
+_URGENCY_THRESHOLDS = (0.3, 0.5, 0.7, 0.9)
+_URGENCY_LABELS = ("none", "low", "medium", "high", "critical")
+
+# Inventory recommendation: short side (ratio < threshold) and long side (ratio > threshold)
+_SHORT_THRESHOLDS = (-0.7, -0.3)
+_LONG_THRESHOLDS = (0.3, 0.7)
+_RECOMMENDATION_LABELS = (
+    "aggressively_buy", "prefer_buy", "balanced", "prefer_sell", "aggressively_sell"
+)
+
+
+@dataclass(slots=True, frozen=True)
 class InventorySignal:
     """Inventory-based trading signal"""
     current_inventory: float  # Current position (positive = long, negative = short)
@@ -32,7 +53,7 @@ class InventorySignal:
     recommendation: str  # Action to take
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class KyleLambdaResult:
     """Kyle's Lambda price impact estimate"""
     lambda_value: float  # Price impact per unit volume
@@ -42,7 +63,7 @@ class KyleLambdaResult:
     spread_multiplier: float  # Suggested spread adjustment
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AvellanedaStoikovSpread:
     """Optimal spread calculation"""
     optimal_spread: float  # Full spread (bid-ask)
@@ -90,18 +111,17 @@ class InventoryManager:
         """Update current inventory position"""
         self.current_inventory = inventory
 
-    def add_trade(self, size: float, side: str):
+    def add_trade(self, size: float, side):
         """
         Add a trade to inventory
 
         Args:
             size: Trade size (positive)
-            side: "buy" or "sell"
+            side: BUY / SELL (or "buy" / "sell"; other strings are ignored)
         """
-        if side == "buy":
-            self.current_inventory += size
-        elif side == "sell":
-            self.current_inventory -= size
+        if isinstance(side, str):
+            side = _SIDE_MAP.get(side, 0)
+        self.current_inventory += size * side
 
     def calculate_reservation_price(
         self,
@@ -133,7 +153,7 @@ class InventoryManager:
             time_remaining = self.T
 
         # Calculate inventory adjustment
-        inventory_adj = self.current_inventory * self.gamma * (volatility ** 2) * time_remaining
+        inventory_adj = self.current_inventory * self.gamma * (volatility * volatility) * time_remaining
 
         # Reservation price
         reservation_price = mid_price - inventory_adj
@@ -155,18 +175,11 @@ class InventoryManager:
         Returns:
             (bid_offset, ask_offset) relative to reservation price
         """
-        # Get reservation price
-        reservation_price = self.calculate_reservation_price(mid_price, volatility)
-
         # Base half-spread
         half_spread = base_spread / 2
 
         # Inventory ratio (-1 to +1)
-        inventory_ratio = np.clip(
-            self.current_inventory / self.max_inventory,
-            -1.0,
-            1.0
-        )
+        inventory_ratio = max(-1.0, min(1.0, self.current_inventory / self.max_inventory))
 
         # Skew spreads based on inventory
         # Positive inventory → widen ask, tighten bid
@@ -194,33 +207,19 @@ class InventoryManager:
         inventory_ratio = self.current_inventory / self.max_inventory
 
         # Determine urgency
-        abs_ratio = abs(inventory_ratio)
-        if abs_ratio > 0.9:
-            urgency = "critical"
-        elif abs_ratio > 0.7:
-            urgency = "high"
-        elif abs_ratio > 0.5:
-            urgency = "medium"
-        elif abs_ratio > 0.3:
-            urgency = "low"
-        else:
-            urgency = "none"
+        urgency = _URGENCY_LABELS[bisect_left(_URGENCY_THRESHOLDS, abs(inventory_ratio))]
 
         # Generate recommendation
-        if inventory_ratio > 0.7:
-            recommendation = "aggressively_sell"
-        elif inventory_ratio > 0.3:
-            recommendation = "prefer_sell"
-        elif inventory_ratio < -0.7:
-            recommendation = "aggressively_buy"
-        elif inventory_ratio < -0.3:
-            recommendation = "prefer_buy"
+        if inventory_ratio < 0:
+            recommendation = _RECOMMENDATION_LABELS[bisect_right(_SHORT_THRESHOLDS, inventory_ratio)]
         else:
-            recommendation = "balanced"
+            recommendation = _RECOMMENDATION_LABELS[2 + bisect_left(_LONG_THRESHOLDS, inventory_ratio)]
 
         # Calculate skews
-        bid_skew = (reservation_price - mid_price) - (mid_price * 0.001)
-        ask_skew = (reservation_price - mid_price) + (mid_price * 0.001)
+        inventory_adj = reservation_price - mid_price
+        edge = mid_price * 0.001
+        bid_skew = inventory_adj - edge
+        ask_skew = inventory_adj + edge
 
         return InventorySignal(
             current_inventory=self.current_inventory,
@@ -248,6 +247,9 @@ class KyleLambdaEstimator:
     Q_t = signed order flow (positive = buy, negative = sell)
     """
 
+    # Trades required before a regression is attempted
+    MIN_TRADES = 10
+
     def __init__(self, window_size: int = 100):
         """
         Initialize Kyle's Lambda estimator
@@ -256,15 +258,40 @@ class KyleLambdaEstimator:
             window_size: Number of trades to use for estimation
         """
         self.window_size = window_size
-        self.price_changes = []
-        self.signed_volumes = []
+
+        # Ring buffers (head = next write slot): y = price change, x = signed volume
+        self._y = np.empty(window_size, dtype=np.float64)
+        self._x = np.empty(window_size, dtype=np.float64)
+        self._head = 0
+        self._n = 0
+
+        # Running sums over the window for O(1) regression
+        self._sx = 0.0
+        self._sy = 0.0
+        self._sxx = 0.0
+        self._syy = 0.0
+        self._sxy = 0.0
+
+    def _ordered(self, buf: np.ndarray) -> np.ndarray:
+        """Window contents of a ring buffer, oldest first"""
+        if self._n < self.window_size:
+            return buf[:self._n]
+        return np.concatenate((buf[self._head:], buf[:self._head]))
+
+    @property
+    def price_changes(self) -> np.ndarray:
+        return self._ordered(self._y)
+
+    @property
+    def signed_volumes(self) -> np.ndarray:
+        return self._ordered(self._x)
 
     def add_trade(
         self,
         price_before: float,
         price_after: float,
         volume: float,
-        side: str  # "buy" or "sell"
+        side  # BUY / SELL, or "buy" / "sell"
     ):
         """
         Add a trade observation
@@ -273,21 +300,96 @@ class KyleLambdaEstimator:
             price_before: Price before trade
             price_after: Price after trade
             volume: Trade volume
-            side: Trade side
+            side: Trade side (anything other than BUY / "buy" counts as a sell)
         """
         # Calculate price change
         price_change = (price_after - price_before) / price_before
 
-        # Signed volume (positive for buy, negative for sell)
-        signed_volume = volume if side == "buy" else -volume
+        # Signed volume (positive for buy, negative for sell); numeric sides
+        # are normalised like strings, so 0 or 2 is a sell, not 0x or 2x volume
+        signed_volume = volume if (side == BUY or side == "buy") else -volume
+
+        y = float(price_change)
+        x = float(signed_volume)
+        head = self._head
+
+        # Maintain window size: evict the oldest observation's contributions
+        if self._n == self.window_size:
+            old_y = float(self._y[head])
+            old_x = float(self._x[head])
+            self._sx -= old_x
+            self._sy -= old_y
+            self._sxx -= old_x * old_x
+            self._syy -= old_y * old_y
+            self._sxy -= old_x * old_y
+        else:
+            self._n += 1
+
+        self._y[head] = y
+        self._x[head] = x
+        self._sx += x
+        self._sy += y
+        self._sxx += x * x
+        self._syy += y * y
+        self._sxy += x * y
+        self._head = (head + 1) % self.window_size
 
-        self.price_changes.append(price_change)
-        self.signed_volumes.append(signed_volume)
+        if self._head == 0:
+            self._resync()
 
-        # Maintain window size
-        if len(self.price_changes) > self.window_size:
-            self.price_changes.pop(0)
-            self.signed_volumes.pop(0)
+    def add_trades_bulk(self, prices_before, prices_after, volumes, sides):
+        """
+        Add a batch of trade observations (e.g. historical replay)
+
+        Args:
+            prices_before: Array-like of prices before each trade
+            prices_after: Array-like of prices after each trade
+            volumes: Array-like of trade volumes
+            sides: Array-like of trade sides: BUY / SELL ints (e.g. int8),
+                "buy" / "sell" strings, or a boolean / 0-1 is-buy mask.
+                As in add_trade, anything other than BUY / "buy" is a sell.
+        """
+        before = np.asarray(prices_before, dtype=np.float64)
+        after = np.asarray(prices_after, dtype=np.float64)
+        volumes = np.asarray(volumes, dtype=np.float64)
+
+        price_changes = (after - before) / before
+        sides = np.asarray(sides)
+        kind = sides.dtype.kind
+        if kind in "biuf":
+            is_buy = sides == BUY
+        elif kind in "US":
+            is_buy = sides == "buy"
+        elif kind == "O":
+            # Mixed Python objects: match each element by its own type
+            is_buy = np.fromiter(
+                (side == BUY or side == "buy" for side in sides.ravel()),
+                dtype=bool, count=sides.size
+            ).reshape(sides.shape)
+        else:
+            raise TypeError(f"Unsupported trade side dtype: {sides.dtype}")
+        signed_volumes = np.where(is_buy, volumes, -volumes)
+
+        # Only the newest window_size trades survive
+        price_changes = price_changes[-self.window_size:]
+        signed_volumes = signed_volumes[-self.window_size:]
+        k = price_changes.shape[0]
+        if k == 0:
+            return
+
+        slots = (self._head + np.arange(k)) % self.window_size
+        self._y[slots] = price_changes
+        self._x[slots] = signed_volumes
+        self._head = (self._head + k) % self.window_size
+        self._n = min(self._n + k, self.window_size)
+        self._resync()
+
+    def _resync(self):
+        """Re-sum the window from the buffers once per wrap to bound float drift"""
+        # OLS sums are order-free: reduce the filled slots in place (one fused
+        # pass, no unrolled copies of the window)
+        n = self._n
+        self._sx, self._sy, self._sxx, self._syy, self._sxy = ols_sums(self._y[:n], self._x[:n])
 
     def estimate_lambda(self) -> Optional[KyleLambdaResult]:
         """
@@ -296,28 +398,28 @@ class KyleLambdaEstimator:
         Returns:
             KyleLambdaResult or None if insufficient data
         """
-        if len(self.price_changes) < 10:
+        n = self._n
+        if n < self.MIN_TRADES:
             return None
 
-        # Convert to numpy arrays
-        y = np.array(self.price_changes)
-        X = np.array(self.signed_volumes)
-
-        # OLS regression: y = λX + ε
+        # OLS regression: y = λX + ε, from the running sums
         # λ = Cov(y,X) / Var(X)
-        if np.var(X) == 0:
+        var_x = self._sxx - self._sx * self._sx / n
+        if var_x <= REL_VARIANCE_EPS * self._sxx:
             return None
 
-        lambda_value = np.cov(y, X)[0, 1] / np.var(X)
+        cov_xy = self._sxy - self._sx * self._sy / n
+
+        # np.cov (ddof=1) over np.var (ddof=0), as in the original estimator
+        lambda_value = (cov_xy / (n - 1)) / (var_x / n)
 
-        # Calculate R²
-        y_pred = lambda_value * X
-        ss_res = np.sum((y - y_pred) ** 2)
-        ss_tot = np.sum((y - np.mean(y)) ** 2)
+        # Calculate R² (residuals of y_pred = λX)
+        ss_res = self._syy - 2 * lambda_value * self._sxy + lambda_value * lambda_value * self._sxx
+        ss_tot = self._syy - self._sy * self._sy / n
         r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0
 
         # Confidence based on R² and sample size
-        confidence = min(r_squared * (len(self.price_changes) / self.window_size), 1.0)
+        confidence = min(r_squared * (n / self.window_size), 1.0)
 
         # Liquidity score (inverse of lambda)
         liquidity_score = 1.0 / abs(lambda_value) if lambda_value != 0 else float('inf')
@@ -363,9 +465,32 @@ class AvellanedaStoikovCalculator:
             k: Order arrival rate
             T: Time horizon
         """
-        self.gamma = gamma
-        self.k = k
+        self._gamma = gamma
+        self._k = k
         self.T = T
+        self._update_constants()
+
+    def _update_constants(self):
+        """Cache the parameter-only spread term (2/γ)ln(1 + γ/k)"""
+        self._const_spread = (2.0 / self._gamma) * math.log(1.0 + self._gamma / self._k)
+
+    @property
+    def gamma(self) -> float:
+        return self._gamma
+
+    @gamma.setter
+    def gamma(self, value: float):
+        self._gamma = value
+        self._update_constants()
+
+    @property
+    def k(self) -> float:
+        return self._k
+
+    @k.setter
+    def k(self, value: float):
+        self._k = value
+        self._update_constants()
 
     def calculate_optimal_spread(
         self,
@@ -391,16 +516,16 @@ class AvellanedaStoikovCalculator:
         if time_remaining is None:
             time_remaining = self.T
 
+        gamma = self._gamma
+        sigma2_t = volatility * volatility * time_remaining
+
         # Calculate reservation price (inventory adjustment)
-        inventory_adj = inventory * self.gamma * (volatility ** 2) * time_remaining
+        inventory_adj = inventory * gamma * sigma2_t
         reservation_price = mid_price - inventory_adj
 
         # Calculate optimal half-spread
-        # δ = γσ²T + (2/γ)ln(1 + γ/k)
-        spread_term1 = self.gamma * (volatility ** 2) * time_remaining
-        spread_term2 = (2 / self.gamma) * math.log(1 + self.gamma / self.k)
-
-        half_spread = spread_term1 + spread_term2
+        # δ = γσ²T + (2/γ)ln(1 + γ/k), second term cached at construction
+        half_spread = gamma * sigma2_t + self._const_spread
 
         # Adjust for illiquidity (Kyle's lambda)
         if kyle_lambda is not None and kyle_lambda > 0:
@@ -424,11 +549,64 @@ class AvellanedaStoikovCalculator:
             reservation_price=reservation_price,
             bid_price=bid_price,
             ask_price=ask_price,
-            gamma=self.gamma,
+            gamma=gamma,
             sigma=volatility,
             inventory_adj=inventory_adj
         )
 
+    def calculate_optimal_spread_batch(
+        self,
+        mid_price,
+        volatility,
+        inventory=0.0,
+        time_remaining=None,
+        kyle_lambda=None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized calculate_optimal_spread for parameter sweeps / grid search
+        Inputs may be scalars or arrays and broadcast against each other
+
+        Args:
+            mid_price: Mid price(s)
+            volatility: Price volatility(s)
+            inventory: Inventory position(s)
+            time_remaining: Time remaining (defaults to T)
+            kyle_lambda: Optional Kyle's lambda(s) for liquidity adjustment
+
+        Returns:
+            Dictionary of arrays keyed like AvellanedaStoikovSpread fields
+        """
+        mid = np.asarray(mid_price, dtype=np.float64)
+        sigma = np.asarray(volatility, dtype=np.float64)
+        q = np.asarray(inventory, dtype=np.float64)
+        t = self.T if time_remaining is None else np.asarray(time_remaining, dtype=np.float64)
+
+        gamma = self._gamma
+        sigma2_t = sigma * sigma * t
+
+        inventory_adj = q * gamma * sigma2_t
+        reservation_price = mid - inventory_adj
+        half_spread = gamma * sigma2_t + self._const_spread
+
+        # Adjust for illiquidity (Kyle's lambda) where positive
+        if kyle_lambda is not None:
+            kl = np.asarray(kyle_lambda, dtype=np.float64)
+            half_spread = half_spread * np.where(kl > 0, 1 + kl * 10, 1.0)
+
+        reservation_price, half_spread, inventory_adj = np.broadcast_arrays(
+            reservation_price, half_spread, inventory_adj
+        )
+
+        return {
+            "optimal_spread": 2 * half_spread,
+            "bid_offset": half_spread,
+            "ask_offset": half_spread,
+            "reservation_price": reservation_price,
+            "bid_price": reservation_price - half_spread,
+            "ask_price": reservation_price + half_spread,
+            "inventory_adj": inventory_adj
+        }
+
 
 # Example usage
 if __name__ == "__main__":
@@ -447,14 +625,14 @@ if __name__ == "__main__":
     # Kyle's Lambda example
     kyle = KyleLambdaEstimator(window_size=50)
 
-    # Simulate trades
-    price = 100.0
-    for i in range(100):
-        side = "buy" if np.random.random() > 0.5 else "sell"
-        volume = np.random.uniform(1, 10)
-        price_before = price
-        price += np.random.normal(0, 0.1) + (0.05 if side == "buy" else -0.05)
-        kyle.add_trade(price_before, price, volume, side)
+    # Simulate trades (all draws in one batch per distribution)
+    rng = np.random.default_rng()
+    is_buy = rng.integers(0, 2, 100).astype(bool)
+    volumes = rng.uniform(1, 10, 100)
+    noise = rng.normal(0, 0.1, 100)
+    prices = 100.0 + np.cumsum(noise + np.where(is_buy, 0.05, -0.05))
+    prices_before = np.concatenate(([100.0], prices[:-1]))
+    kyle.add_trades_bulk(prices_before, prices, volumes, np.where(is_buy, BUY, SELL).astype(np.int8))
 
     lambda_result = kyle.estimate_lambda()
     if lambda_result:
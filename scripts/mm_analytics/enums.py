@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Integer enums shared by the analytics modules
+
+Results keep their string fields (regime, toxicity_level) for reports and
+serialization; these ids sit alongside them so hot-path checks are integer
+identity compares instead of string equality.
+"""
+
+from enum import IntEnum
+
+
+class Regime(IntEnum):
+    """Orderflow regime (values index orderflow's per-regime lookup tables)"""
+    MEAN_REVERTING = 0
+    NEUTRAL = 1
+    TRENDING = 2
+    UNKNOWN = 3
+
+    @property
+    def label(self) -> str:
+        """String form used in results, e.g. "mean_reverting" """
+        return self.name.lower()
+
+
+class Toxicity(IntEnum):
+    """VPIN toxicity level, ordered from least to most toxic"""
+    SAFE = 0
+    NORMAL = 1
+    ELEVATED = 2
+    HIGH = 3
+    UNKNOWN = 4
+
+    @property
+    def label(self) -> str:
+        """String form used in results, e.g. "elevated" """
+        return self.name.lower()
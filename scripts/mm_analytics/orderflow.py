@@ -16,12 +16,38 @@ Trading Strategy:
 
 import numpy as np
 from typing import List, Dict, Optional, Tuple
-from collections import deque
 from dataclasses import dataclass
 import math
 
+from ._kernels import REL_VARIANCE_EPS, ar1_sums, lag_autocorr
+from .enums import Regime
 
-@dataclass
+
+# Half-life constants: -ln 2, and the finite cap for φ close to 1
+# (persistence saturates at a half-life of 50, so the cap never changes the regime)
+_NEG_LN2 = -math.log(2.0)
+_MAX_HALF_LIFE = 1000.0
+
+# Regime ids (index into the lookup tables below)
+REGIME_MEAN_REVERTING = Regime.MEAN_REVERTING
+REGIME_NEUTRAL = Regime.NEUTRAL
+REGIME_TRENDING = Regime.TRENDING
+REGIME_UNKNOWN = Regime.UNKNOWN
+
+# Members by value, so classification indexes a tuple instead of calling Regime()
+_REGIMES = tuple(Regime)
+
+_REGIME_NAMES = tuple(regime.label for regime in _REGIMES)
+_REGIME_RECOMMENDATIONS = (
+    "tighten_spreads_aggressive_quotes", "standard_spreads", None, "insufficient_data"
+)
+
+# Quote aggressiveness = base + persistence * slope
+_REGIME_AGG_BASE = (0.5, 1.0, 1.5, 1.0)
+_REGIME_AGG_SLOPE = (0.3, 0.0, 0.5, 0.0)
+
+
+@dataclass(slots=True, frozen=True)
 class ImbalanceResult:
     """Orderflow imbalance analysis result"""
     current_imbalance: float  # Current bid-ask imbalance
@@ -31,6 +57,7 @@ class ImbalanceResult:
     persistence: float  # 0-1, how long imbalances last
     recommendation: str  # Strategy recommendation
     confidence: float  # Confidence in regime classification
+    regime_id: Regime = Regime.UNKNOWN  # Enum form of regime
 
 
 class OrderflowAnalyzer:
@@ -54,9 +81,53 @@ class OrderflowAnalyzer:
         self.window_size = window_size
         self.imbalance_threshold = imbalance_threshold
 
-        # Historical data
-        self.imbalances = deque(maxlen=window_size)
-        self.timestamps = deque(maxlen=window_size)
+        # Historical data: imbalance and timestamp ring buffers sharing one
+        # head (next write slot) and count; missing timestamps are stored as 0.
+        # Imbalances lie in [-1, 1], so float32 storage is ample (sums stay float64)
+        self._buf = np.empty(window_size, dtype=np.float32)
+        self._ts = np.zeros(window_size, dtype=np.int64)
+        self._head = 0
+        self._n = 0
+
+        # Bumped on every ingest; classify_regime / detect_regime_shift results
+        # are memoized against it (several components query per tick)
+        self._version = 0
+        self._regime_cache: Optional[Tuple[tuple, ImbalanceResult]] = None
+        self._shift_cache: Optional[Tuple[tuple, Optional[Dict]]] = None
+
+        # Running sums over the window: S1 = Σx, S2 = Σx², Sxy = Σ x_t·x_{t-1}
+        # Keeps the AR(1) / lag-1 statistics O(1) per call
+        self._s1 = 0.0
+        self._s2 = 0.0
+        self._sxy = 0.0
+
+    @property
+    def imbalances(self) -> np.ndarray:
+        """Imbalances in the window, oldest first"""
+        if self._n < self.window_size:
+            return self._buf[:self._n]
+        return np.concatenate((self._buf[self._head:], self._buf[:self._head]))
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Observation timestamps aligned with `imbalances` (0 where none was given)"""
+        if self._n < self.window_size:
+            return self._ts[:self._n]
+        return np.concatenate((self._ts[self._head:], self._ts[:self._head]))
+
+    def _recent_view(self, n: int, offset: int = 0) -> np.ndarray:
+        """
+        The n imbalances ending `offset` observations before the newest
+
+        Returns a view into the ring buffer unless the range crosses the wrap
+        point, in which case the two pieces are concatenated. Caller ensures
+        n + offset <= number of stored observations.
+        """
+        end = (self._head - offset - 1) % self.window_size + 1
+        start = end - n
+        if start >= 0:
+            return self._buf[start:end]
+        return np.concatenate((self._buf[start:], self._buf[:end]))
 
     def calculate_imbalance(
         self,
@@ -99,10 +170,93 @@ class OrderflowAnalyzer:
             ask_liquidity: Ask side liquidity
             timestamp: Optional timestamp
         """
-        imbalance = self.calculate_imbalance(bid_liquidity, ask_liquidity)
-        self.imbalances.append(imbalance)
-        if timestamp is not None:
-            self.timestamps.append(timestamp)
+        # Round to the stored float32 so the running sums match the buffer
+        x = float(np.float32(self.calculate_imbalance(bid_liquidity, ask_liquidity)))
+        buf = self._buf
+        size = self.window_size
+        head = self._head
+
+        if self._n == size:
+            # Evict the oldest sample and its pair with the next-oldest
+            oldest = float(buf[head])
+            self._s1 -= oldest
+            self._s2 -= oldest * oldest
+            if size > 1:
+                self._sxy -= oldest * float(buf[(head + 1) % size])
+        else:
+            self._n += 1
+
+        # Pair the new sample with the current newest (slot head-1)
+        if self._n > 1:
+            self._sxy += x * float(buf[head - 1])
+
+        buf[head] = x
+        self._ts[head] = timestamp or 0
+        self._version += 1
+        self._s1 += x
+        self._s2 += x * x
+        self._head = (head + 1) % size
+
+        if self._head == 0:
+            self._resync()
+
+    def add_observations_bulk(
+        self,
+        bid_liquidity,
+        ask_liquidity,
+        timestamps: Optional[List[int]] = None
+    ):
+        """
+        Add a batch of orderbook observations (e.g. historical replay)
+
+        Args:
+            bid_liquidity: Array-like of bid side liquidity
+            ask_liquidity: Array-like of ask side liquidity
+            timestamps: Optional timestamps, one per observation
+        """
+        bid = np.asarray(bid_liquidity, dtype=np.float64)
+        ask = np.asarray(ask_liquidity, dtype=np.float64)
+        total = bid + ask
+        imbalances = np.divide(bid - ask, total, out=np.zeros_like(total), where=total != 0)
+
+        # Only the newest window_size observations survive
+        imbalances = imbalances[-self.window_size:]
+        k = imbalances.shape[0]
+        if k > 0:
+            slots = (self._head + np.arange(k)) % self.window_size
+            self._buf[slots] = imbalances
+            if timestamps is not None:
+                self._ts[slots] = np.asarray(timestamps, dtype=np.int64)[-k:]
+            else:
+                self._ts[slots] = 0
+            self._head = (self._head + k) % self.window_size
+            self._n = min(self._n + k, self.window_size)
+            self._version += 1
+            self._resync()
+
+    def _resync(self):
+        """Re-sum the window from the buffer once per wrap to bound float drift"""
+        self._s1, self._s2, self._sxy = ar1_sums(self.imbalances)
+
+    def _lag1_moments(self) -> Tuple[float, float, float]:
+        """
+        Centered lag-1 sums over the n-1 pairs (x_t, x_{t-1}) from the running sums
+
+        Returns:
+            (Σ(x_t - x̄_t)(x_{t-1} - x̄_{t-1}), Σ(x_t - x̄_t)², Σ(x_{t-1} - x̄_{t-1})²)
+        """
+        m = self._n - 1
+        oldest = float(self._buf[self._head if self._n == self.window_size else 0])
+        newest = float(self._buf[self._head - 1])
+
+        sum_t = self._s1 - oldest
+        sum_lag = self._s1 - newest
+
+        cov = self._sxy - sum_t * sum_lag / m
+        var_t = (self._s2 - oldest * oldest) - sum_t * sum_t / m
+        var_lag = (self._s2 - newest * newest) - sum_lag * sum_lag / m
+
+        return cov, var_t, var_lag
 
     def calculate_half_life(self) -> Optional[float]:
         """
@@ -118,28 +272,28 @@ class OrderflowAnalyzer:
         Returns:
             Half-life in periods (or None if insufficient data)
         """
-        if len(self.imbalances) < 10:
+        if self._n < 10:
             return None
 
-        # Fit AR(1) model
-        imbalances = np.array(self.imbalances)
-
-        # Lag-1 autocorrelation coefficient (φ)
-        x_t = imbalances[1:]
-        x_t_1 = imbalances[:-1]
+        # Fit AR(1) model from the running lag-1 sums
+        cov, _, var_lag = self._lag1_moments()
 
         # OLS: φ = Cov(x_t, x_{t-1}) / Var(x_{t-1})
-        if np.var(x_t_1) == 0:
+        if var_lag <= REL_VARIANCE_EPS * self._s2:
             return None
 
-        phi = np.cov(x_t, x_t_1)[0, 1] / np.var(x_t_1)
+        # np.cov (ddof=1) over np.var (ddof=0), as in the original estimator
+        m = self._n - 1
+        phi = (cov / (m - 1)) / (var_lag / m)
 
         # Calculate half-life
         if phi <= 0 or phi >= 1:
             # No mean reversion or explosive
             return float('inf')
 
-        half_life = -math.log(2) / math.log(phi)
+        # log1p stays accurate as φ approaches 1; clamping (rather than
+        # branching on φ) keeps the half-life monotonic up to the cap
+        half_life = min(_NEG_LN2 / math.log1p(phi - 1.0), _MAX_HALF_LIFE)
 
         return half_life
 
@@ -156,22 +310,19 @@ class OrderflowAnalyzer:
         Returns:
             Autocorrelation coefficient (-1 to 1)
         """
-        if len(self.imbalances) < lag + 10:
-            return 0.0
-
-        imbalances = np.array(self.imbalances)
-
-        # Calculate autocorrelation
-        x_t = imbalances[lag:]
-        x_t_lag = imbalances[:-lag]
-
-        # Pearson correlation
-        if np.std(x_t) == 0 or np.std(x_t_lag) == 0:
+        if self._n < lag + 10:
             return 0.0
 
-        autocorr = np.corrcoef(x_t, x_t_lag)[0, 1]
+        if lag == 1:
+            # O(1) from the running sums
+            cov, var_t, var_lag = self._lag1_moments()
+            floor = REL_VARIANCE_EPS * self._s2
+            if var_t <= floor or var_lag <= floor:
+                return 0.0
+            return cov / math.sqrt(var_t * var_lag)
 
-        return autocorr
+        # Pearson correlation of x_t with x_{t-lag}
+        return lag_autocorr(self.imbalances, lag)
 
     def classify_regime(self) -> ImbalanceResult:
         """
@@ -185,7 +336,18 @@ class OrderflowAnalyzer:
         Returns:
             ImbalanceResult with regime classification
         """
-        if len(self.imbalances) < 20:
+        key = (self._version, self.imbalance_threshold)
+        cached = self._regime_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        result = self._classify_regime()
+        self._regime_cache = (key, result)
+        return result
+
+    def _classify_regime(self) -> ImbalanceResult:
+        """Uncached body of classify_regime"""
+        if self._n < 20:
             return ImbalanceResult(
                 current_imbalance=0.0,
                 half_life=None,
@@ -197,7 +359,7 @@ class OrderflowAnalyzer:
             )
 
         # Calculate metrics
-        current_imbalance = self.imbalances[-1]
+        current_imbalance = float(self._buf[self._head - 1])
         half_life = self.calculate_half_life()
         autocorr = self.calculate_autocorrelation(lag=1)
 
@@ -215,23 +377,19 @@ class OrderflowAnalyzer:
 
         persistence = (hl_score + ac_score) / 2
 
-        # Classify regime
-        if persistence < 0.3:
-            regime = "mean_reverting"
-            recommendation = "tighten_spreads_aggressive_quotes"
-        elif persistence > 0.7:
-            regime = "trending"
+        # Classify regime: < 0.3 mean-reverting, > 0.7 trending, otherwise neutral
+        regime_id = _REGIMES[int(persistence >= 0.3) + int(persistence > 0.7)]
+        regime = _REGIME_NAMES[regime_id]
+        recommendation = _REGIME_RECOMMENDATIONS[regime_id]
+        if regime_id is Regime.TRENDING:
             if abs(current_imbalance) > self.imbalance_threshold:
                 direction = "bullish" if current_imbalance > 0 else "bearish"
                 recommendation = f"widen_spreads_skew_{direction}"
             else:
                 recommendation = "widen_spreads_neutral"
-        else:
-            regime = "neutral"
-            recommendation = "standard_spreads"
 
         # Confidence based on sample size and consistency
-        confidence = min(len(self.imbalances) / self.window_size, 1.0)
+        confidence = min(self._n / self.window_size, 1.0)
 
         return ImbalanceResult(
             current_imbalance=current_imbalance,
@@ -240,7 +398,8 @@ class OrderflowAnalyzer:
             regime=regime,
             persistence=persistence,
             recommendation=recommendation,
-            confidence=confidence
+            confidence=confidence,
+            regime_id=regime_id
         )
 
     def get_trade_aggressiveness(self, regime_result: ImbalanceResult) -> float:
@@ -252,15 +411,9 @@ class OrderflowAnalyzer:
             < 1.0 = tighter spreads
             > 1.0 = wider spreads
         """
-        if regime_result.regime == "mean_reverting":
-            # Tighten spreads significantly
-            return 0.5 + (regime_result.persistence * 0.3)
-        elif regime_result.regime == "trending":
-            # Widen spreads significantly
-            return 1.5 + (regime_result.persistence * 0.5)
-        else:
-            # Neutral
-            return 1.0
+        # Mean-reverting tightens, trending widens, neutral/unknown stay at 1.0
+        regime_id = regime_result.regime_id
+        return _REGIME_AGG_BASE[regime_id] + regime_result.persistence * _REGIME_AGG_SLOPE[regime_id]
 
     def detect_regime_shift(self, lookback: int = 20) -> Optional[Dict]:
         """
@@ -274,16 +427,27 @@ class OrderflowAnalyzer:
         Returns:
             Dictionary with shift info or None
         """
-        if len(self.imbalances) < lookback * 2:
+        key = (self._version, lookback)
+        cached = self._shift_cache
+        if cached is None or cached[0] != key:
+            cached = (key, self._detect_regime_shift(lookback))
+            self._shift_cache = cached
+
+        # Hand out a copy so callers cannot alter the memoized dict
+        return dict(cached[1]) if cached[1] is not None else None
+
+    def _detect_regime_shift(self, lookback: int) -> Optional[Dict]:
+        """Uncached body of detect_regime_shift"""
+        if self._n < lookback * 2:
             return None
 
         # Split into recent and previous periods
-        recent = list(self.imbalances)[-lookback:]
-        previous = list(self.imbalances)[-lookback*2:-lookback]
+        recent = self._recent_view(lookback)
+        previous = self._recent_view(lookback, offset=lookback)
 
         # Calculate autocorrelation for each
-        recent_autocorr = np.corrcoef(recent[1:], recent[:-1])[0, 1] if len(recent) > 1 else 0
-        prev_autocorr = np.corrcoef(previous[1:], previous[:-1])[0, 1] if len(previous) > 1 else 0
+        recent_autocorr = lag_autocorr(recent, 1)
+        prev_autocorr = lag_autocorr(previous, 1)
 
         # Check for significant change
         change = abs(recent_autocorr - prev_autocorr)
@@ -311,18 +475,25 @@ class OrderflowAnalyzer:
 
 # Example usage
 if __name__ == "__main__":
+    rng = np.random.default_rng()
+
+    def simulate_imbalances(phi: float, noise: np.ndarray) -> np.ndarray:
+        """AR(1) imbalance path driven by pre-drawn noise"""
+        path = np.empty_like(noise)
+        imbalance = 0.0
+        for i, eps in enumerate(noise):
+            imbalance = phi * imbalance + eps
+            path[i] = imbalance
+        return path
+
     # Initialize analyzer
     analyzer = OrderflowAnalyzer(window_size=100)
 
     # Simulate mean-reverting regime
     print("Simulating Mean-Reverting Regime:")
-    imbalance = 0.0
-    for i in range(100):
-        # Mean-reverting behavior: imbalance oscillates around 0
-        imbalance = 0.7 * imbalance - 0.3 * imbalance + np.random.normal(0, 0.1)
-        bid_liq = 1000 * (1 + imbalance)
-        ask_liq = 1000 * (1 - imbalance)
-        analyzer.add_observation(bid_liq, ask_liq)
+    # Mean-reverting behavior: imbalance oscillates around 0
+    imbalances = simulate_imbalances(0.4, rng.normal(0, 0.1, 100))
+    analyzer.add_observations_bulk(1000 * (1 + imbalances), 1000 * (1 - imbalances))
 
     result = analyzer.classify_regime()
     print(f"  Regime: {result.regime}")
@@ -335,13 +506,9 @@ if __name__ == "__main__":
     analyzer = OrderflowAnalyzer(window_size=100)
 
     print("\nSimulating Trending Regime:")
-    imbalance = 0.0
-    for i in range(100):
-        # Trending behavior: imbalance has momentum
-        imbalance = 0.95 * imbalance + 0.05 * np.random.normal(0, 0.1)
-        bid_liq = 1000 * (1 + imbalance)
-        ask_liq = 1000 * (1 - imbalance)
-        analyzer.add_observation(bid_liq, ask_liq)
+    # Trending behavior: imbalance has momentum
+    imbalances = simulate_imbalances(0.95, 0.05 * rng.normal(0, 0.1, 100))
+    analyzer.add_observations_bulk(1000 * (1 + imbalances), 1000 * (1 - imbalances))
 
     result = analyzer.classify_regime()
     print(f"  Regime: {result.regime}")
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Build the optional Cython kernels (_ckernels.pyx) in place
+
+Usage:
+    cd scripts/mm_analytics
+    python3 setup_kernels.py build_ext --inplace
+
+Without the built extension, mm_analytics._kernels falls back to numba,
+then to NumPy.
+"""
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+setup(
+    name="mm_analytics_kernels",
+    ext_modules=cythonize(
+        [Extension("_ckernels", ["_ckernels.pyx"], extra_compile_args=["-O3"])],
+        compiler_directives={"language_level": "3"},
+    ),
+)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for KyleLambdaEstimator's running-sum ring buffer
+
+Run from scripts/:
+    python3 -m unittest mm_analytics.test_avellaneda_stoikov
+"""
+
+import math
+import unittest
+from collections import deque
+
+import numpy as np
+
+from .avellaneda_stoikov import BUY, SELL, KyleLambdaEstimator
+
+
+WINDOW = 16
+STEPS = 5 * WINDOW + 3  # several wraps, ending mid-window
+
+
+def _trades(steps, seed=0):
+    """Prices before/after, volumes and is-buy flags with a linear price impact"""
+    rng = np.random.default_rng(seed)
+    is_buy = rng.integers(0, 2, steps).astype(bool)
+    volumes = rng.exponential(1.0, steps)
+    before = 100.0 + rng.normal(0.0, 1.0, steps)
+    impact = 0.001 * np.where(is_buy, volumes, -volumes) + rng.normal(0.0, 1e-4, steps)
+    return before, before * (1.0 + impact), volumes, is_buy
+
+
+def _reference(y, x):
+    """Brute-force λ and R² over the window (np.cov ddof=1 over np.var ddof=0)"""
+    if len(y) < KyleLambdaEstimator.MIN_TRADES:
+        return None
+    lambda_value = np.cov(y, x)[0, 1] / np.var(x)
+    ss_res = ((y - lambda_value * x) ** 2).sum()
+    ss_tot = ((y - y.mean()) ** 2).sum()
+    return lambda_value, 1.0 - ss_res / ss_tot
+
+
+class RollingWindowTest(unittest.TestCase):
+    def assertClose(self, a, b, msg=None):
+        self.assertTrue(math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12), f"{a} != {b}: {msg}")
+
+    def assertSameEstimate(self, a, b, msg=None):
+        ra, rb = a.estimate_lambda(), b.estimate_lambda()
+        if ra is None or rb is None:
+            self.assertIs(ra, rb, msg)
+            return
+        self.assertClose(ra.lambda_value, rb.lambda_value, msg)
+        self.assertClose(ra.r_squared, rb.r_squared, msg)
+
+    def test_add_trade_matches_brute_force(self):
+        before, after, volumes, is_buy = _trades(STEPS)
+        estimator = KyleLambdaEstimator(window_size=WINDOW)
+        ys, xs = deque(maxlen=WINDOW), deque(maxlen=WINDOW)
+        wraps = 0
+
+        for i in range(STEPS):
+            estimator.add_trade(before[i], after[i], volumes[i], BUY if is_buy[i] else SELL)
+            ys.append((after[i] - before[i]) / before[i])
+            xs.append(volumes[i] if is_buy[i] else -volumes[i])
+            wraps += estimator._head == 0
+            y, x = np.array(ys), np.array(xs)
+
+            np.testing.assert_array_equal(estimator.price_changes, y)
+            np.testing.assert_array_equal(estimator.signed_volumes, x)
+            # Running sums, including right after an eviction on the wrap
+            self.assertClose(estimator._sx, x.sum(), i)
+            self.assertClose(estimator._sxy, (x * y).sum(), i)
+            self.assertClose(estimator._sxx, (x * x).sum(), i)
+
+            result, expected = estimator.estimate_lambda(), _reference(y, x)
+            if expected is None:
+                self.assertIsNone(result, i)
+            else:
+                self.assertClose(result.lambda_value, expected[0], i)
+                self.assertClose(result.r_squared, expected[1], i)
+
+        self.assertGreaterEqual(wraps, 5)
+
+    def test_bulk_matches_per_trade(self):
+        before, after, volumes, is_buy = _trades(STEPS, seed=1)
+        single = KyleLambdaEstimator(window_size=WINDOW)
+        # Every accepted side encoding must give the same window
+        sides = {
+            "int8": np.where(is_buy, BUY, SELL).astype(np.int8),
+            "str": np.where(is_buy, "buy", "sell"),
+            "bool": is_buy,
+            "0/1": is_buy.astype(np.int64),
+            "object": np.array([BUY if b else SELL for b in is_buy], dtype=object),
+        }
+        bulk = {name: KyleLambdaEstimator(window_size=WINDOW) for name in sides}
+        rng = np.random.default_rng(2)
+
+        start = 0
+        while start < STEPS:
+            # Chunks from a single trade up to more than a full window
+            stop = min(start + int(rng.integers(1, 2 * WINDOW + 2)), STEPS)
+            for i in range(start, stop):
+                single.add_trade(before[i], after[i], volumes[i], "buy" if is_buy[i] else "sell")
+            for name, estimator in bulk.items():
+                estimator.add_trades_bulk(
+                    before[start:stop], after[start:stop], volumes[start:stop], sides[name][start:stop]
+                )
+                np.testing.assert_array_equal(single.signed_volumes, estimator.signed_volumes, err_msg=name)
+                self.assertSameEstimate(single, estimator, (name, stop))
+            start = stop
+
+
+if __name__ == "__main__":
+    unittest.main()
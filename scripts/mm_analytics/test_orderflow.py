@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for OrderflowAnalyzer's running-sum ring buffer
+
+Run from scripts/:
+    python3 -m unittest mm_analytics.test_orderflow
+"""
+
+import math
+import unittest
+from collections import deque
+
+import numpy as np
+
+from .orderflow import OrderflowAnalyzer
+
+
+WINDOW = 16
+STEPS = 5 * WINDOW + 3  # several wraps, ending mid-window
+
+
+def _liquidity(steps, seed=0):
+    """Bid/ask liquidity whose imbalance follows a mean-reverting AR(1)"""
+    rng = np.random.default_rng(seed)
+    imbalances = np.empty(steps)
+    imbalance = 0.0
+    for i, eps in enumerate(rng.normal(0.0, 0.2, steps)):
+        imbalance = float(np.clip(0.6 * imbalance + eps, -0.95, 0.95))
+        imbalances[i] = imbalance
+    return 1000.0 * (1.0 + imbalances), 1000.0 * (1.0 - imbalances)
+
+
+def _reference_half_life(x):
+    """Brute-force AR(1) half-life over the window (np.cov ddof=1 over np.var ddof=0)"""
+    if len(x) < 10:
+        return None
+    phi = np.cov(x[1:], x[:-1])[0, 1] / np.var(x[:-1])
+    if phi <= 0 or phi >= 1:
+        return math.inf
+    return min(-math.log(2.0) / math.log(phi), 1000.0)
+
+
+def _reference_autocorr(x, lag):
+    if len(x) < lag + 10:
+        return 0.0
+    return float(np.corrcoef(x[lag:], x[:-lag])[0, 1])
+
+
+class RollingWindowTest(unittest.TestCase):
+    def assertClose(self, a, b, msg=None):
+        if a is None or b is None or math.isinf(a) or math.isinf(b):
+            self.assertEqual(a, b, msg)
+        else:
+            self.assertTrue(math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12), f"{a} != {b}: {msg}")
+
+    def assertSameState(self, a, b, msg=None):
+        np.testing.assert_array_equal(a.imbalances, b.imbalances, err_msg=str(msg))
+        self.assertClose(a.calculate_half_life(), b.calculate_half_life(), msg)
+        for lag in (1, 3):
+            self.assertClose(a.calculate_autocorrelation(lag), b.calculate_autocorrelation(lag), msg)
+
+    def test_add_observation_matches_brute_force(self):
+        bid, ask = _liquidity(STEPS)
+        analyzer = OrderflowAnalyzer(window_size=WINDOW)
+        window = deque(maxlen=WINDOW)
+        wraps = 0
+
+        for i in range(STEPS):
+            analyzer.add_observation(bid[i], ask[i])
+            window.append(float(np.float32((bid[i] - ask[i]) / (bid[i] + ask[i]))))
+            wraps += analyzer._head == 0
+            x = np.array(window, dtype=np.float64)
+
+            np.testing.assert_array_equal(analyzer.imbalances, x)
+            # Running sums, including right after an eviction on the wrap
+            self.assertClose(analyzer._s1, x.sum(), i)
+            self.assertClose(analyzer._s2, (x * x).sum(), i)
+            self.assertClose(analyzer._sxy, (x[1:] * x[:-1]).sum(), i)
+
+            self.assertClose(analyzer.calculate_half_life(), _reference_half_life(x), i)
+            for lag in (1, 3):
+                self.assertClose(analyzer.calculate_autocorrelation(lag), _reference_autocorr(x, lag), i)
+
+        self.assertGreaterEqual(wraps, 5)
+
+    def test_bulk_matches_per_observation(self):
+        bid, ask = _liquidity(STEPS, seed=1)
+        single = OrderflowAnalyzer(window_size=WINDOW)
+        bulk = OrderflowAnalyzer(window_size=WINDOW)
+        rng = np.random.default_rng(2)
+
+        start = 0
+        while start < STEPS:
+            # Chunks from a single observation up to more than a full window
+            stop = min(start + int(rng.integers(1, 2 * WINDOW + 2)), STEPS)
+            for i in range(start, stop):
+                single.add_observation(bid[i], ask[i])
+            bulk.add_observations_bulk(bid[start:stop], ask[start:stop])
+            self.assertSameState(single, bulk, stop)
+            start = stop
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for UnifiedMMSignal serialization
+
+Run from scripts/:
+    python3 -m unittest mm_analytics.test_unified_mm_analyzer
+"""
+
+import dataclasses
+import json
+import math
+import unittest
+from unittest import mock
+
+from . import unified_mm_analyzer
+from .unified_mm_analyzer import UnifiedMMAnalyzer
+
+
+def _signal_with_infinite_half_life():
+    """Real signal from a warmed-up analyzer, with orderflow.half_life = inf"""
+    analyzer = UnifiedMMAnalyzer(pair="WETH-USDC", dex="lynex", max_inventory=100.0)
+    snapshot = {"timestamp": 1700000000, "current_price": 1850.0, "tick_liquidity": {}}
+    for i in range(60):
+        snapshot["timestamp"] = 1700000000 + i
+        snapshot["current_price"] = 1850.0 * (1.0 + 0.001 * math.sin(i))
+        signal = analyzer.process_tick_snapshot(snapshot, current_inventory=10.0)
+    orderflow = dataclasses.replace(signal.orderflow, half_life=math.inf)
+    return dataclasses.replace(signal, orderflow=orderflow)
+
+
+class ToJsonTest(unittest.TestCase):
+    def setUp(self):
+        self.signal = _signal_with_infinite_half_life()
+
+    def _fallback(self, full):
+        with mock.patch.object(unified_mm_analyzer, "orjson", None):
+            return self.signal.to_json(full=full)
+
+    def test_fallback_writes_null_for_non_finite(self):
+        for full in (False, True):
+            decoded = json.loads(self._fallback(full))
+            self.assertIsNone(decoded["orderflow"]["half_life"])
+
+    @unittest.skipIf(unified_mm_analyzer.orjson is None, "orjson not installed")
+    def test_orjson_matches_fallback(self):
+        for full in (False, True):
+            self.assertEqual(
+                json.loads(self.signal.to_json(full=full)),
+                json.loads(self._fallback(full)),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Tests for VolatilityEstimator's per-candle terms and running sums
+
+Run from scripts/:
+    python3 -m unittest mm_analytics.test_volatility
+"""
+
+import math
+import unittest
+from collections import deque
+
+import numpy as np
+
+from .volatility import VolatilityEstimator
+
+
+WINDOW = 12
+MIN_PERIODS = 5
+STEPS = 5 * WINDOW + 5  # several wraps, ending mid-window
+
+
+def _candles(steps, seed=0, invalid_rate=0.15):
+    """Random-walk OHLC candles, with some invalid ones mixed in"""
+    rng = np.random.default_rng(seed)
+    candles = []
+    price = 100.0
+    for _ in range(steps):
+        open_price = price
+        price *= math.exp(rng.normal(0.0, 0.01))
+        high = max(open_price, price) * (1.0 + abs(rng.normal(0.0, 0.005)))
+        low = min(open_price, price) * (1.0 - abs(rng.normal(0.0, 0.005)))
+        candle = [open_price, high, low, price]
+        if rng.random() < invalid_rate:
+            kind = int(rng.integers(0, 4))
+            if kind == 0:
+                candle[1], candle[2] = low, high  # high < low
+            elif kind == 1:
+                candle[2] = 0.0  # non-positive low
+            elif kind == 2:
+                candle[0] = -1.0  # non-positive open
+            else:
+                candle[3] = 0.0  # non-positive close (also breaks both returns)
+        candles.append(tuple(candle))
+    return candles
+
+
+def _reference(window, annualize):
+    """(realized, parkinson, garman_klass) recomputed over the window, as the loops did"""
+    def annualized(vol, n):
+        return vol * math.sqrt(VolatilityEstimator.BLOCKS_PER_YEAR / n) if annualize else vol
+
+    returns = [
+        math.log(c1 / c0)
+        for (_, _, _, c0), (_, _, _, c1) in zip(window, list(window)[1:])
+        if c0 > 0 and c1 > 0
+    ]
+    realized = annualized(float(np.std(returns, ddof=1)), len(returns)) if len(returns) >= 2 else None
+
+    hl_sq = [math.log(h / l) ** 2 for _, h, l, _ in window if h > 0 and l > 0 and h >= l]
+    parkinson = (
+        annualized(math.sqrt(sum(hl_sq) / (4 * len(hl_sq) * math.log(2))), len(hl_sq))
+        if len(hl_sq) >= 2 else None
+    )
+
+    variances = [
+        0.5 * math.log(h / l) ** 2 - (2 * math.log(2) - 1) * math.log(c / o) ** 2
+        for o, h, l, c in window
+        if min(o, h, l, c) > 0 and h >= l
+    ]
+    garman_klass = (
+        annualized(math.sqrt(float(np.mean(variances))), len(variances))
+        if len(variances) >= 2 else None
+    )
+    return realized, parkinson, garman_klass
+
+
+def _old_estimate_from_ticks(estimator, tick_snapshots, period_blocks):
+    """The per-snapshot candle loop estimate_from_ticks used to run"""
+    candles = []
+    current = None
+    start_block = tick_snapshots[0]["block"]
+    for snapshot in tick_snapshots:
+        price = snapshot["current_price"]
+        index = (snapshot["block"] - start_block) // period_blocks
+        if current is None or current["index"] != index:
+            if current is not None:
+                candles.append(current)
+            current = {"index": index, "open": price, "high": price, "low": price, "close": price}
+        else:
+            current["high"] = max(current["high"], price)
+            current["low"] = min(current["low"], price)
+            current["close"] = price
+    candles.append(current)
+
+    for candle in candles:
+        estimator.add_candle(candle["open"], candle["high"], candle["low"], candle["close"])
+    return estimator.estimate()
+
+
+class VolatilityTest(unittest.TestCase):
+    def assertClose(self, a, b, msg=None):
+        if a is None or b is None:
+            self.assertEqual(a, b, msg)
+        else:
+            self.assertTrue(math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-15), f"{a} != {b}: {msg}")
+
+    def assertSameResult(self, a, b, msg=None):
+        if a is None or b is None:
+            self.assertIs(a, b, msg)
+            return
+        for name in ("realized_vol", "parkinson_vol", "garman_klass_vol", "recommended_vol", "confidence"):
+            self.assertClose(getattr(a, name), getattr(b, name), (name, msg))
+        self.assertEqual(a.num_periods, b.num_periods, msg)
+
+    def test_add_candle_matches_recomputation(self):
+        for annualize in (False, True):
+            estimator = VolatilityEstimator(WINDOW, MIN_PERIODS, annualize=annualize)
+            window = deque(maxlen=WINDOW)
+            wraps = 0
+
+            for i, candle in enumerate(_candles(STEPS)):
+                estimator.add_candle(*candle)
+                window.append(candle)
+                wraps += estimator._head == 0
+
+                self.assertEqual(
+                    [tuple(c.values()) for c in estimator.candles], list(window), i
+                )
+                realized, parkinson, garman_klass = _reference(window, annualize)
+                if len(window) < MIN_PERIODS:
+                    self.assertIsNone(estimator.estimate(), i)
+                    continue
+                # Individual estimators and estimate() (which reads the running sums)
+                self.assertClose(estimator.realized_volatility(), realized, i)
+                self.assertClose(estimator.parkinson_volatility(), parkinson, i)
+                self.assertClose(estimator.garman_klass_volatility(), garman_klass, i)
+                result = estimator.estimate()
+                self.assertClose(result.realized_vol, realized or 0.0, i)
+                self.assertClose(result.parkinson_vol, parkinson or 0.0, i)
+                self.assertClose(result.garman_klass_vol, garman_klass or 0.0, i)
+
+            self.assertGreaterEqual(wraps, 5)
+
+    def test_invalid_candles_are_skipped(self):
+        estimator = VolatilityEstimator(WINDOW, min_periods=2, annualize=False)
+        estimator.add_candle(100.0, 101.0, 99.0, 100.5)
+        estimator.add_candle(100.5, 99.0, 101.0, 100.0)  # high < low
+        estimator.add_candle(100.0, 101.0, 0.0, 100.2)   # non-positive low
+        estimator.add_candle(-1.0, 101.0, 99.5, 100.4)   # non-positive open
+
+        # Range terms only from the valid first candle and the open-less last one
+        self.assertEqual(estimator._park_n, 2)
+        self.assertEqual(estimator._gk_n, 1)
+        self.assertIsNone(estimator.garman_klass_volatility())
+        self.assertEqual(estimator._rv_n, 3)
+
+        estimator.add_candle(100.4, 101.0, 99.0, 0.0)    # non-positive close
+        self.assertEqual(estimator._rv_n, 3)  # neither return touching it counts
+        estimator.add_candle(100.0, 101.0, 99.0, 100.0)
+        self.assertEqual(estimator._rv_n, 3)
+
+        window = [tuple(c.values()) for c in estimator.candles]
+        realized, parkinson, garman_klass = _reference(window, annualize=False)
+        self.assertClose(estimator.realized_volatility(), realized)
+        self.assertClose(estimator.parkinson_volatility(), parkinson)
+        self.assertClose(estimator.garman_klass_volatility(), garman_klass)
+
+    def test_bulk_matches_per_candle(self):
+        candles = _candles(STEPS, seed=1)
+        single = VolatilityEstimator(WINDOW, MIN_PERIODS)
+        bulk = VolatilityEstimator(WINDOW, MIN_PERIODS)
+        rng = np.random.default_rng(2)
+
+        start = 0
+        while start < STEPS:
+            # Chunks from a single candle up to more than a full window
+            stop = min(start + int(rng.integers(1, 2 * WINDOW + 2)), STEPS)
+            for candle in candles[start:stop]:
+                single.add_candle(*candle)
+            bulk.add_candles_bulk(*zip(*candles[start:stop]))
+
+            self.assertEqual(single.candles, bulk.candles, stop)
+            self.assertEqual(
+                (single._rv_n, single._park_n, single._gk_n), (bulk._rv_n, bulk._park_n, bulk._gk_n), stop
+            )
+            self.assertSameResult(single.estimate(), bulk.estimate(), stop)
+            # A per-candle add after a bulk load must evict the right terms
+            single.add_candle(*candles[start])
+            bulk.add_candle(*candles[start])
+            self.assertSameResult(single.estimate(), bulk.estimate(), stop)
+            start = stop
+
+    def test_estimate_from_ticks_matches_candle_loop(self):
+        rng = np.random.default_rng(3)
+        # Irregular block spacing: several snapshots per candle, and gaps
+        # that skip whole candle periods
+        blocks = 1_000 + np.cumsum(rng.integers(1, 8, 400))
+        prices = 1850.0 * np.exp(np.cumsum(rng.normal(0.0, 0.001, 400)))
+        snapshots = [
+            {"block": int(block), "current_price": float(price), "timestamp": int(block) * 2}
+            for block, price in zip(blocks, prices)
+        ]
+
+        for period_blocks in (1, 5, 10):
+            new = VolatilityEstimator(window_periods=30, min_periods=10)
+            old = VolatilityEstimator(window_periods=30, min_periods=10)
+            # Twice, so the second call lands on a full, wrapped window
+            for chunk in (snapshots[:150], snapshots[150:]):
+                self.assertSameResult(
+                    new.estimate_from_ticks(chunk, period_blocks),
+                    _old_estimate_from_ticks(old, chunk, period_blocks),
+                    period_blocks,
+                )
+                self.assertEqual(new.candles, old.candles, period_blocks)
+
+        self.assertIsNone(VolatilityEstimator().estimate_from_ticks([]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for VPINCalculator's batch ingest and VPIN history
+
+Run from scripts/:
+    python3 -m unittest mm_analytics.test_vpin
+"""
+
+import math
+import unittest
+
+import numpy as np
+
+from .vpin import VPINCalculator
+
+
+NUM_BUCKETS = 8
+BUCKET_SIZE = 5.0
+THRESHOLD = 0.02  # non-zero, so small price moves are split 50/50
+
+
+def _trades(steps, seed=0):
+    """Random-walk prices (cent ticks, with repeats) and exponential volumes"""
+    rng = np.random.default_rng(seed)
+    moves = rng.choice((-0.05, -0.01, 0.0, 0.01, 0.05), size=steps)
+    prices = np.round(100.0 + np.cumsum(moves), 2)
+    volumes = rng.exponential(1.5, steps)
+    return prices, volumes
+
+
+def _calculator():
+    return VPINCalculator(bucket_size=BUCKET_SIZE, num_buckets=NUM_BUCKETS, price_change_threshold=THRESHOLD)
+
+
+class BatchIngestTest(unittest.TestCase):
+    def test_add_trades_matches_add_trade(self):
+        prices, volumes = _trades(2000)
+        single = _calculator()
+        batch = _calculator()
+        rng = np.random.default_rng(1)
+
+        single_results = []
+        batch_results = []
+        start = 0
+        while start < len(prices):
+            # Batch sizes well below and above a bucket's worth of trades, so
+            # buckets keep opening in one batch and closing in a later one
+            stop = min(start + int(rng.integers(1, 15)), len(prices))
+            for i in range(start, stop):
+                result = single.add_trade(prices[i], volumes[i])
+                if result is not None:
+                    single_results.append(result.vpin)
+            batch_results.extend(r.vpin for r in batch.add_trades(prices[start:stop], volumes[start:stop]))
+
+            self.assertEqual(single._n, batch._n)
+            self.assertEqual(single._head, batch._head)
+            self.assertEqual(single.last_price, batch.last_price)
+            for key, value in single.current_bucket.items():
+                self.assertAlmostEqual(value, batch.current_bucket[key], places=9)
+            np.testing.assert_array_equal(
+                single._ordered(single._vpin), batch._ordered(batch._vpin), err_msg=str(stop)
+            )
+            start = stop
+
+        self.assertGreater(len(single_results), 2 * NUM_BUCKETS)
+        np.testing.assert_array_equal(single_results, batch_results)
+
+
+class RecentStatsTest(unittest.TestCase):
+    def test_stats_over_recent_closes(self):
+        prices, volumes = _trades(1500, seed=2)
+        calc = _calculator()
+        # VPIN at every bucket close: NaN until the first window is full
+        closes = [math.nan] * (NUM_BUCKETS - 1)
+        for price, volume in zip(prices, volumes):
+            result = calc.add_trade(price, volume)
+            if result is not None:
+                closes.append(result.vpin)
+        self.assertGreater(len(closes), 2 * NUM_BUCKETS)
+
+        for lookback in (1, 3, NUM_BUCKETS, 2 * NUM_BUCKETS):
+            stats = calc.get_recent_vpin_stats(lookback)
+            self.assertNotIn("error", stats)
+
+            recent = np.array(closes[-min(lookback, NUM_BUCKETS):])
+            self.assertAlmostEqual(stats["mean_vpin"], recent.mean(), places=12)
+            self.assertAlmostEqual(stats["std_vpin"], recent.std(), places=12)
+            self.assertEqual(stats["min_vpin"], recent.min())
+            self.assertEqual(stats["max_vpin"], recent.max())
+            self.assertEqual(stats["current_vpin"], recent[-1])
+            if lookback > 1:
+                slope = np.polyfit(np.arange(recent.size), recent, 1)[0]
+                self.assertEqual(stats["trend"], "increasing" if slope > 0 else "decreasing")
+
+    def test_stats_skip_closes_before_the_window_filled(self):
+        calc = _calculator()
+        self.assertEqual(calc.get_recent_vpin_stats(), {"error": "no_data"})
+
+        prices, volumes = _trades(400, seed=3)
+        closes = 0
+        for price, volume in zip(prices, volumes):
+            if calc.add_trade(price, volume) is not None:
+                closes += 1
+                break
+            if calc._n:
+                self.assertEqual(calc.get_recent_vpin_stats(), {"error": "insufficient_data"})
+
+        # Exactly one full window so far: only its VPIN counts
+        self.assertEqual(closes, 1)
+        stats = calc.get_recent_vpin_stats(NUM_BUCKETS)
+        self.assertEqual(stats["min_vpin"], stats["max_vpin"])
+        self.assertEqual(stats["std_vpin"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,9 +13,18 @@ Integrates:
 Outputs actionable MM signals for Sapient HRM → Hummingbot MCP
 """
 
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Optional, Tuple
+from dataclasses import dataclass, fields
+from itertools import product
 import json
+import math
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; to_json falls back to the json module
+    orjson = None
 
 from .vpin import VPINCalculator, VPINResult
 from .volatility import VolatilityEstimator, VolatilityResult
@@ -28,9 +37,92 @@ from .avellaneda_stoikov import (
     AvellanedaStoikovSpread
 )
 from .orderflow import OrderflowAnalyzer, ImbalanceResult
+from .enums import Regime, Toxicity
+
+
+# Field names per result dataclass, resolved once per type
+_FIELD_CACHE: Dict[type, Tuple[str, ...]] = {}
+
 
+def _flatten(obj) -> Optional[Dict]:
+    """
+    Shallow dict of a flat result dataclass (all analytics results hold scalars)
+
+    Cheaper than dataclasses.asdict, which recurses and deep-copies every value.
+    """
+    if obj is None:
+        return None
+    cls = type(obj)
+    names = _FIELD_CACHE.get(cls)
+    if names is None:
+        names = _FIELD_CACHE.setdefault(cls, tuple(f.name for f in fields(cls)))
+    return {name: getattr(obj, name) for name in names}
+
+
+# Fields each result contributes to the default (wire) form of to_dict
+_WIRE_FIELDS: Dict[type, Tuple[str, ...]] = {
+    VPINResult: ("vpin", "toxicity_level", "recommendation", "confidence"),
+    VolatilityResult: ("recommended_vol", "confidence", "num_periods"),
+    InventorySignal: ("current_inventory", "inventory_ratio", "reservation_price", "urgency"),
+    KyleLambdaResult: ("lambda_value", "confidence", "spread_multiplier"),
+    ImbalanceResult: ("regime", "half_life", "persistence", "confidence"),
+    AvellanedaStoikovSpread: ("optimal_spread", "reservation_price", "sigma"),
+}
+
+
+def _project(obj) -> Optional[Dict]:
+    """Wire-format dict of a result: only the fields listed in _WIRE_FIELDS"""
+    if obj is None:
+        return None
+    return {name: getattr(obj, name) for name in _WIRE_FIELDS[type(obj)]}
+
+
+def _json_safe(obj):
+    """
+    Copy of a to_dict() tree for the stdlib json fallback
 
-@dataclass
+    NaN/±inf become None and NumPy scalars Python scalars, matching what orjson
+    writes (null for non-finite floats), so both encoders emit the same JSON.
+    """
+    if isinstance(obj, dict):
+        return {key: _json_safe(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_json_safe(value) for value in obj]
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+
+def _decide_action(inventory_risk: str, toxicity_risk: str, regime: Regime) -> str:
+    """Action policy; evaluated once per key to build _ACTION_TABLE"""
+    # Critical inventory takes priority
+    if inventory_risk == "critical":
+        return "rebalance_inventory"
+    # High toxicity → pause or wide spreads
+    if toxicity_risk == "high":
+        return "pause"
+    # High inventory + elevated toxicity → pause
+    if inventory_risk == "high" and toxicity_risk == "medium":
+        return "quote_wide"
+    # Mean-reverting + low toxicity → tight spreads
+    if regime is Regime.MEAN_REVERTING and toxicity_risk == "low":
+        return "quote_tight"
+    # Trending or elevated toxicity → wide spreads
+    if regime is Regime.TRENDING or toxicity_risk == "medium":
+        return "quote_wide"
+    return "quote_normal"
+
+
+# (inventory_risk, toxicity_risk, regime) → action, for every reachable key
+_ACTION_TABLE: Dict[Tuple[str, str, Regime], str] = {
+    key: _decide_action(*key)
+    for key in product(("low", "high", "critical"), ("low", "medium", "high"), Regime)
+}
+
+
+@dataclass(slots=True, frozen=True)
 class UnifiedMMSignal:
     """Comprehensive market making signal"""
     timestamp: int
@@ -54,20 +146,25 @@ class UnifiedMMSignal:
     # Unified recommendation
     action: str  # "quote_tight", "quote_normal", "quote_wide", "pause", "rebalance_inventory"
     confidence: float  # 0-1
-    reasoning: List[str]  # Human-readable explanation
+    reasoning: Tuple[str, ...]  # Human-readable explanation
 
     # Risk assessment
     toxicity_risk: str  # "low", "medium", "high"
     inventory_risk: str  # "low", "medium", "high", "critical"
     liquidity_risk: str  # "low", "medium", "high"
 
-    def to_dict(self) -> Dict:
-        """Convert to dictionary for JSON serialization"""
-        def convert_dataclass(obj):
-            if obj is None:
-                return None
-            return asdict(obj)
+    def to_dict(self, full: bool = False) -> Dict:
+        """
+        Convert to dictionary for JSON serialization
+
+        Args:
+            full: Include every field of each analytics result instead of
+                the compact wire subset (_WIRE_FIELDS); for debugging
 
+        Returns:
+            Dictionary of the signal
+        """
+        convert = _flatten if full else _project
         return {
             "timestamp": self.timestamp,
             "pair": self.pair,
@@ -76,20 +173,40 @@ class UnifiedMMSignal:
             "bid_price": self.bid_price,
             "ask_price": self.ask_price,
             "spread_bps": self.spread_bps,
-            "vpin": convert_dataclass(self.vpin),
-            "volatility": convert_dataclass(self.volatility),
-            "inventory": convert_dataclass(self.inventory),
-            "kyle_lambda": convert_dataclass(self.kyle_lambda),
-            "orderflow": convert_dataclass(self.orderflow),
-            "avellaneda_stoikov": convert_dataclass(self.avellaneda_stoikov),
+            "vpin": convert(self.vpin),
+            "volatility": convert(self.volatility),
+            "inventory": convert(self.inventory),
+            "kyle_lambda": convert(self.kyle_lambda),
+            "orderflow": convert(self.orderflow),
+            "avellaneda_stoikov": convert(self.avellaneda_stoikov),
             "action": self.action,
             "confidence": self.confidence,
-            "reasoning": self.reasoning,
+            "reasoning": list(self.reasoning),
             "toxicity_risk": self.toxicity_risk,
             "inventory_risk": self.inventory_risk,
             "liquidity_risk": self.liquidity_risk
         }
 
+    def to_json(self, full: bool = False) -> bytes:
+        """
+        Serialize straight to JSON bytes for publishing
+
+        Args:
+            full: Encode the complete signal (as to_dict(full=True)) instead
+                of the compact wire form
+
+        With orjson installed the full dataclass tree (and any NumPy scalars)
+        is encoded natively, without building the intermediate to_dict() tree.
+        Non-finite floats (e.g. an infinite half_life) are written as null
+        with or without orjson.
+        """
+        if orjson is not None:
+            obj = self if full else self.to_dict()
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(
+            _json_safe(self.to_dict(full)), separators=(",", ":"), allow_nan=False
+        ).encode()
+
 
 class UnifiedMMAnalyzer:
     """
@@ -131,6 +248,9 @@ class UnifiedMMAnalyzer:
         # State
         self.last_mid_price = None
 
+        # Latest (vpin, volatility, kyle_lambda, orderflow) results, see update_analytics
+        self._analytics = (None, None, None, self.orderflow.classify_regime())
+
     def process_tick_snapshot(
         self,
         snapshot: Dict,
@@ -139,6 +259,8 @@ class UnifiedMMAnalyzer:
         """
         Process a tick snapshot and generate comprehensive MM signal
 
+        Equivalent to update_analytics() followed by quote_snapshot().
+
         Args:
             snapshot: Tick snapshot from DEX adapter
             current_inventory: Optional current inventory position
@@ -146,38 +268,90 @@ class UnifiedMMAnalyzer:
         Returns:
             UnifiedMMSignal with all analytics
         """
-        timestamp = snapshot["timestamp"]
-        mid_price = snapshot["current_price"]
-        tick_liquidity = snapshot.get("tick_liquidity", {})
+        self.update_analytics(snapshot, current_inventory)
+        return self.quote_snapshot(snapshot)
 
+    def update_analytics(
+        self,
+        snapshot: Dict,
+        current_inventory: Optional[float] = None
+    ):
+        """
+        Feed a tick snapshot to the analytics and store their results
+
+        The stored results are what quote_snapshot() quotes from, so a
+        latency-sensitive loop can quote tick N from the tick N-1 analytics
+        and run this after the quotes are out.
+
+        Args:
+            snapshot: Tick snapshot from DEX adapter
+            current_inventory: Optional current inventory position
+        """
         # Calculate bid/ask liquidity from tick distribution
-        current_tick = snapshot.get("current_tick")
-        bid_liq, ask_liq = self._calculate_bid_ask_liquidity(tick_liquidity, current_tick)
+        bid_liq, ask_liq = self._calculate_bid_ask_liquidity(
+            snapshot.get("tick_liquidity", {}),
+            snapshot.get("current_tick")
+        )
 
         # Update inventory if provided
         if current_inventory is not None:
             self.inventory_mgr.update_inventory(current_inventory)
 
         # Update orderflow analyzer
-        self.orderflow.add_observation(bid_liq, ask_liq, timestamp)
+        orderflow = self.orderflow
+        orderflow.add_observation(bid_liq, ask_liq, snapshot["timestamp"])
+
+        # Get analytics results (during burn-in none of them has data yet)
+        if self._warm():
+            vpin = self.vpin
+            vpin_result = vpin.calculate_vpin() if vpin._n >= vpin.num_buckets else None
+            vol_result = self.volatility.estimate()
+            kyle_result = self.kyle_lambda.estimate_lambda()
+        else:
+            vpin_result = vol_result = kyle_result = None
+
+        # Swapped in as one tuple so quoting never sees a partial update
+        self._analytics = (vpin_result, vol_result, kyle_result, orderflow.classify_regime())
+
+    def quote_snapshot(
+        self,
+        snapshot: Dict,
+        current_inventory: Optional[float] = None
+    ) -> UnifiedMMSignal:
+        """
+        Generate the MM signal for a snapshot from the last stored analytics
+
+        Only the mid-price and inventory dependent parts (inventory signal,
+        Avellaneda-Stoikov spread, recommendation) are computed here.
+
+        Args:
+            snapshot: Tick snapshot from DEX adapter
+            current_inventory: Optional current inventory position
+
+        Returns:
+            UnifiedMMSignal with the stored analytics
+        """
+        timestamp = snapshot["timestamp"]
+        mid_price = snapshot["current_price"]
+        inventory_mgr = self.inventory_mgr
+
+        if current_inventory is not None:
+            inventory_mgr.update_inventory(current_inventory)
 
-        # Get analytics results
-        vpin_result = self.vpin.calculate_vpin() if len(self.vpin.buckets) >= self.vpin.num_buckets else None
-        vol_result = self.volatility.estimate()
-        inventory_signal = self.inventory_mgr.get_inventory_signal(
+        vpin_result, vol_result, kyle_result, orderflow_result = self._analytics
+        vol = vol_result.recommended_vol if vol_result else None
+        inventory_signal = inventory_mgr.get_inventory_signal(
             mid_price,
-            vol_result.recommended_vol if vol_result else 0.2
+            vol if vol is not None else 0.2
         )
-        kyle_result = self.kyle_lambda.estimate_lambda()
-        orderflow_result = self.orderflow.classify_regime()
 
         # Calculate Avellaneda-Stoikov optimal spread
         as_spread = None
-        if vol_result:
+        if vol is not None:
             as_spread = self.as_calculator.calculate_optimal_spread(
                 mid_price=mid_price,
-                volatility=vol_result.recommended_vol,
-                inventory=self.inventory_mgr.current_inventory,
+                volatility=vol,
+                inventory=inventory_mgr.current_inventory,
                 kyle_lambda=kyle_result.lambda_value if kyle_result else None
             )
 
@@ -218,12 +392,24 @@ class UnifiedMMAnalyzer:
             avellaneda_stoikov=as_spread,
             action=action,
             confidence=confidence,
-            reasoning=reasoning,
+            reasoning=tuple(reasoning),
             toxicity_risk=risks["toxicity"],
             inventory_risk=risks["inventory"],
             liquidity_risk=risks["liquidity"]
         )
 
+    def _warm(self) -> bool:
+        """
+        Whether any of VPIN, volatility or Kyle's lambda has enough data
+
+        Until then each would return None, so their calls are skipped.
+        """
+        return (
+            self.vpin._n >= self.vpin.num_buckets
+            or self.volatility._n >= self.volatility.min_periods
+            or self.kyle_lambda._n >= self.kyle_lambda.MIN_TRADES
+        )
+
     def _calculate_bid_ask_liquidity(
         self,
         tick_liquidity: Dict,
@@ -233,20 +419,27 @@ class UnifiedMMAnalyzer:
         if not tick_liquidity or current_tick is None:
             return (1000.0, 1000.0)  # Default
 
-        bid_liq = 0.0
-        ask_liq = 0.0
-
-        for tick_str, tick_data in tick_liquidity.items():
-            tick = int(tick_str)
-            liquidity = float(tick_data.get("liquidityGross", 0))
+        ticks, liquidity = self._parse_tick_liquidity(tick_liquidity)
 
-            if tick < current_tick:
-                bid_liq += liquidity
-            else:
-                ask_liq += liquidity
+        # Ticks below the current tick are bid side, the rest ask side
+        below = ticks < current_tick
+        bid_liq = float(liquidity[below].sum())
+        ask_liq = float(liquidity[~below].sum())
 
         return (bid_liq, ask_liq)
 
+    @staticmethod
+    def _parse_tick_liquidity(tick_liquidity: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        """Tick indices and gross liquidity of a tick_liquidity map as parallel arrays"""
+        count = len(tick_liquidity)
+        ticks = np.fromiter(map(int, tick_liquidity.keys()), dtype=np.int64, count=count)
+        liquidity = np.fromiter(
+            (float(tick_data.get("liquidityGross", 0)) for tick_data in tick_liquidity.values()),
+            dtype=np.float64,
+            count=count
+        )
+        return ticks, liquidity
+
     def _generate_recommendation(
         self,
         vpin: Optional[VPINResult],
@@ -272,11 +465,11 @@ class UnifiedMMAnalyzer:
 
         # Analyze VPIN (toxicity)
         if vpin:
-            if vpin.toxicity_level == "high":
+            if vpin.toxicity_id is Toxicity.HIGH:
                 reasoning.append(f"High VPIN ({vpin.vpin:.2f}) - toxic flow detected")
                 toxicity_risk = "high"
                 confidence_factors.append(vpin.confidence)
-            elif vpin.toxicity_level == "elevated":
+            elif vpin.toxicity_id is Toxicity.ELEVATED:
                 reasoning.append(f"Elevated VPIN ({vpin.vpin:.2f}) - caution advised")
                 toxicity_risk = "medium"
                 confidence_factors.append(vpin.confidence * 0.7)
@@ -295,31 +488,16 @@ class UnifiedMMAnalyzer:
                 confidence_factors.append(kyle_lambda.confidence)
 
         # Analyze orderflow regime
-        if orderflow.regime == "mean_reverting" and orderflow.confidence > 0.5:
+        regime = orderflow.regime_id
+        if regime is Regime.MEAN_REVERTING and orderflow.confidence > 0.5:
             reasoning.append(f"Mean-reverting regime (HL={orderflow.half_life:.1f}) - tighten spreads" if orderflow.half_life else "Mean-reverting regime")
             confidence_factors.append(orderflow.confidence)
-        elif orderflow.regime == "trending" and orderflow.confidence > 0.5:
+        elif regime is Regime.TRENDING and orderflow.confidence > 0.5:
             reasoning.append(f"Trending regime (AC={orderflow.autocorrelation:.2f}) - widen spreads")
             confidence_factors.append(orderflow.confidence)
 
         # Determine action
-        action = "quote_normal"
-
-        # Critical inventory takes priority
-        if inventory_risk == "critical":
-            action = "rebalance_inventory"
-        # High toxicity → pause or wide spreads
-        elif toxicity_risk == "high":
-            action = "pause"
-        # High inventory + elevated toxicity → pause
-        elif inventory_risk == "high" and toxicity_risk == "medium":
-            action = "quote_wide"
-        # Mean-reverting + low toxicity → tight spreads
-        elif orderflow.regime == "mean_reverting" and toxicity_risk == "low":
-            action = "quote_tight"
-        # Trending or elevated toxicity → wide spreads
-        elif orderflow.regime == "trending" or toxicity_risk == "medium":
-            action = "quote_wide"
+        action = _ACTION_TABLE.get((inventory_risk, toxicity_risk, regime), "quote_normal")
 
         # Calculate overall confidence
         confidence = sum(confidence_factors) / len(confidence_factors) if confidence_factors else 0.5
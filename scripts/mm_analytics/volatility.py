@@ -19,13 +19,18 @@ Where:
 """
 
 import numpy as np
-from typing import List, Dict, Optional
-from collections import deque
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 import math
 
+from ._kernels import ohlc_vol_stats, yang_zhang_moments, _GK_CO_WEIGHT
 
-@dataclass
+
+_LN2 = math.log(2.0)
+_FOUR_LN2 = 4.0 * _LN2  # Parkinson denominator factor
+
+
+@dataclass(slots=True, frozen=True)
 class VolatilityResult:
     """Volatility estimation result"""
     realized_vol: float  # Close-to-close volatility
@@ -64,8 +69,60 @@ class VolatilityEstimator:
         self.min_periods = min_periods
         self.annualize = annualize
 
-        # State: store OHLC candles
-        self.candles = deque(maxlen=window_periods)
+        # State: OHLC ring buffers, one contiguous array per field
+        # (head = next write slot)
+        self._o = np.empty(window_periods, dtype=np.float64)
+        self._h = np.empty(window_periods, dtype=np.float64)
+        self._l = np.empty(window_periods, dtype=np.float64)
+        self._c = np.empty(window_periods, dtype=np.float64)
+        self._head = 0
+        self._n = 0
+
+        # Per-candle estimator terms, NaN where the candle is invalid:
+        # log return vs the previous close, ln(H/L)², Garman-Klass term
+        self._rv_c = np.full(window_periods, np.nan)
+        self._park_c = np.full(window_periods, np.nan)
+        self._gk_c = np.full(window_periods, np.nan)
+
+        # Running sums of those terms over the window, so estimate() is O(1).
+        # The oldest candle's return is excluded (its previous close has left
+        # the window). Re-derived from the OHLC buffers once per wrap.
+        self._rv_sum = 0.0
+        self._rv_sq_sum = 0.0
+        self._rv_n = 0
+        self._park_sum = 0.0
+        self._park_n = 0
+        self._gk_sum = 0.0
+        self._gk_n = 0
+
+    def _ordered(self, buf: np.ndarray) -> np.ndarray:
+        """Window of a ring buffer, oldest first (a view until the buffer wraps)"""
+        if self._n < self.window_periods:
+            return buf[:self._n]
+        return np.concatenate((buf[self._head:], buf[:self._head]))
+
+    def _view(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Open, high, low and close arrays, oldest first"""
+        return (
+            self._ordered(self._o),
+            self._ordered(self._h),
+            self._ordered(self._l),
+            self._ordered(self._c),
+        )
+
+    @property
+    def candles(self) -> List[Dict]:
+        """Candles in the window as dicts, oldest first"""
+        o, h, l, c = self._view()
+        return [
+            {
+                "open": float(o[i]),
+                "high": float(h[i]),
+                "low": float(l[i]),
+                "close": float(c[i])
+            }
+            for i in range(self._n)
+        ]
 
     def add_candle(
         self,
@@ -83,16 +140,140 @@ class VolatilityEstimator:
             high_price: High price
             low_price: Low price
             close_price: Closing price
-            timestamp: Optional timestamp
+            timestamp: Accepted for compatibility; not stored (no estimator uses it)
         """
-        candle = {
-            "open": open_price,
-            "high": high_price,
-            "low": low_price,
-            "close": close_price,
-            "timestamp": timestamp
-        }
-        self.candles.append(candle)
+        log = math.log  # local alias: this runs once per candle
+        size = self.window_periods
+        head = self._head
+        has_prev = self._n > 0 and size > 1
+        prev_close = self._c[head - 1]
+
+        if self._n == size:
+            # Evict the oldest candle's terms...
+            park = self._park_c[head]
+            if park == park:
+                self._park_sum -= park
+                self._park_n -= 1
+            gk = self._gk_c[head]
+            if gk == gk:
+                self._gk_sum -= gk
+                self._gk_n -= 1
+            # ...and the return pairing the next-oldest with it
+            if size > 1:
+                r = self._rv_c[(head + 1) % size]
+                if r == r:
+                    self._rv_sum -= r
+                    self._rv_sq_sum -= r * r
+                    self._rv_n -= 1
+        else:
+            self._n += 1
+
+        # Terms for the new candle (same validity rules as the kernels)
+        r = park = gk = math.nan
+        if has_prev and prev_close > 0 and close_price > 0:
+            r = log(close_price / prev_close)
+            self._rv_sum += r
+            self._rv_sq_sum += r * r
+            self._rv_n += 1
+        if high_price > 0 and low_price > 0 and high_price >= low_price:
+            hl = log(high_price / low_price)
+            park = hl * hl
+            self._park_sum += park
+            self._park_n += 1
+            if open_price > 0 and close_price > 0:
+                co = log(close_price / open_price)
+                gk = 0.5 * park - _GK_CO_WEIGHT * co * co
+                self._gk_sum += gk
+                self._gk_n += 1
+
+        self._o[head] = open_price
+        self._h[head] = high_price
+        self._l[head] = low_price
+        self._c[head] = close_price
+        self._rv_c[head] = r
+        self._park_c[head] = park
+        self._gk_c[head] = gk
+        self._head = (head + 1) % size
+
+        if self._head == 0:
+            self._resync()
+
+    def add_candles_bulk(
+        self,
+        open_prices,
+        high_prices,
+        low_prices,
+        close_prices,
+        timestamps: Optional[List[Optional[int]]] = None
+    ):
+        """
+        Add a batch of candles, oldest first (e.g. historical replay)
+
+        Args:
+            open_prices: Array-like of opening prices
+            high_prices: Array-like of high prices
+            low_prices: Array-like of low prices
+            close_prices: Array-like of closing prices
+            timestamps: Accepted for compatibility; not stored
+        """
+        # Only the newest window_periods candles survive
+        size = self.window_periods
+        columns = [
+            np.asarray(prices, dtype=np.float64)[-size:]
+            for prices in (open_prices, high_prices, low_prices, close_prices)
+        ]
+        k = columns[0].shape[0]
+        if k == 0:
+            return
+
+        slots = (self._head + np.arange(k)) % size
+        for buf, values in zip((self._o, self._h, self._l, self._c), columns):
+            buf[slots] = values
+
+        self._head = (self._head + k) % size
+        self._n = min(self._n + k, size)
+        self._rebuild_terms()
+
+    def _rebuild_terms(self):
+        """Recompute every per-candle term from the OHLC buffers, then the sums"""
+        o, h, l, c = self._view()
+        n = self._n
+        slots = (self._head - n + np.arange(n)) % self.window_periods
+
+        rv = np.full(n, np.nan)
+        valid = (c[:-1] > 0) & (c[1:] > 0)
+        rv[1:][valid] = np.log(c[1:][valid] / c[:-1][valid])
+
+        park = np.full(n, np.nan)
+        park_valid = (h > 0) & (l > 0) & (h >= l)
+        hl = np.log(h[park_valid] / l[park_valid])
+        park[park_valid] = hl * hl
+
+        gk = np.full(n, np.nan)
+        gk_valid = park_valid & (o > 0) & (c > 0)
+        co = np.log(c[gk_valid] / o[gk_valid])
+        gk[gk_valid] = 0.5 * park[gk_valid] - _GK_CO_WEIGHT * co * co
+
+        self._rv_c[slots] = rv
+        self._park_c[slots] = park
+        self._gk_c[slots] = gk
+        self._resync()
+
+    def _resync(self):
+        """Re-derive the running sums from the OHLC buffers (bounds float drift)"""
+        (self._rv_sum, self._rv_sq_sum, self._rv_n,
+         self._park_sum, self._park_n,
+         self._gk_sum, self._gk_n) = ohlc_vol_stats(*self._view())
+
+    def _to_vol(self, variance: float, n: int) -> float:
+        """
+        Volatility from a per-period variance, annualized over n periods if enabled
+
+        Annualization is folded under the one square root: √var · √(B/n) = √(var · B/n)
+        """
+        if self.annualize:
+            variance *= self.BLOCKS_PER_YEAR / n
+        return math.sqrt(variance)
 
     def realized_volatility(self) -> Optional[float]:
         """
@@ -104,30 +285,18 @@ class VolatilityEstimator:
         Returns:
             Annualized volatility or None if insufficient data
         """
-        if len(self.candles) < self.min_periods:
+        if self._n < self.min_periods:
             return None
 
-        # Calculate log returns
-        returns = []
-        for i in range(1, len(self.candles)):
-            prev_close = self.candles[i-1]["close"]
-            curr_close = self.candles[i]["close"]
+        return self._realized_from(self._rv_sum, self._rv_sq_sum, self._rv_n)
 
-            if prev_close > 0 and curr_close > 0:
-                log_return = math.log(curr_close / prev_close)
-                returns.append(log_return)
-
-        if len(returns) < 2:
+    def _realized_from(self, r_sum: float, r_sq_sum: float, n: int) -> Optional[float]:
+        """Realized volatility from Σr and Σr² over n log returns"""
+        if n < 2:
             return None
 
-        # Calculate volatility
-        vol = np.std(returns, ddof=1)  # Sample standard deviation
-
-        # Annualize if requested
-        if self.annualize:
-            vol *= math.sqrt(self.BLOCKS_PER_YEAR / len(returns))
-
-        return vol
+        # Sample variance
+        return self._to_vol(max((r_sq_sum - r_sum * r_sum / n) / (n - 1), 0.0), n)
 
     def parkinson_volatility(self) -> Optional[float]:
         """
@@ -141,31 +310,18 @@ class VolatilityEstimator:
         Returns:
             Annualized volatility or None if insufficient data
         """
-        if len(self.candles) < self.min_periods:
+        if self._n < self.min_periods:
             return None
 
-        # Calculate high-low ratios
-        hl_ratios = []
-        for candle in self.candles:
-            high = candle["high"]
-            low = candle["low"]
+        return self._parkinson_from(self._park_sum, self._park_n)
 
-            if high > 0 and low > 0 and high >= low:
-                hl_ratio = math.log(high / low)
-                hl_ratios.append(hl_ratio ** 2)
-
-        if len(hl_ratios) < 2:
+    def _parkinson_from(self, hl_sq_sum: float, n: int) -> Optional[float]:
+        """Parkinson volatility from Σ ln(H/L)² over n valid candles"""
+        if n < 2:
             return None
 
         # Parkinson estimator
-        n = len(hl_ratios)
-        vol = math.sqrt(sum(hl_ratios) / (4 * n * math.log(2)))
-
-        # Annualize if requested
-        if self.annualize:
-            vol *= math.sqrt(self.BLOCKS_PER_YEAR / n)
-
-        return vol
+        return self._to_vol(hl_sq_sum / (_FOUR_LN2 * n), n)
 
     def garman_klass_volatility(self) -> Optional[float]:
         """
@@ -179,42 +335,18 @@ class VolatilityEstimator:
         Returns:
             Annualized volatility or None if insufficient data
         """
-        if len(self.candles) < self.min_periods:
+        if self._n < self.min_periods:
             return None
 
-        variances = []
-
-        for candle in self.candles:
-            open_price = candle["open"]
-            high_price = candle["high"]
-            low_price = candle["low"]
-            close_price = candle["close"]
-
-            # Validate prices
-            if any(p <= 0 for p in [open_price, high_price, low_price, close_price]):
-                continue
-            if high_price < low_price:
-                continue
+        return self._garman_klass_from(self._gk_sum, self._gk_n)
 
-            # Garman-Klass formula
-            hl_term = 0.5 * (math.log(high_price / low_price) ** 2)
-            co_term = (2 * math.log(2) - 1) * (math.log(close_price / open_price) ** 2)
-
-            variance = hl_term - co_term
-            variances.append(variance)
-
-        if len(variances) < 2:
+    def _garman_klass_from(self, variance_sum: float, n: int) -> Optional[float]:
+        """Garman-Klass volatility from the summed variance terms of n valid candles"""
+        if n < 2:
             return None
 
         # Calculate volatility
-        mean_variance = np.mean(variances)
-        vol = math.sqrt(mean_variance)
-
-        # Annualize if requested
-        if self.annualize:
-            vol *= math.sqrt(self.BLOCKS_PER_YEAR / len(variances))
-
-        return vol
+        return self._to_vol(variance_sum / n, n)
 
     def yang_zhang_volatility(self) -> Optional[float]:
         """
@@ -233,54 +365,21 @@ class VolatilityEstimator:
         Returns:
             Annualized volatility or None if insufficient data
         """
-        if len(self.candles) < self.min_periods + 1:
+        if self._n < self.min_periods + 1:
             return None
 
-        # Calculate components
-        overnight_returns = []
-        rs_components = []
+        # Overnight-return variance and mean Rogers-Satchell component over
+        # valid (previous close, candle) pairs
+        sigma_o_sq, sigma_rs_sq, n = yang_zhang_moments(*self._view())
 
-        for i in range(1, len(self.candles)):
-            prev_candle = self.candles[i-1]
-            curr_candle = self.candles[i]
-
-            prev_close = prev_candle["close"]
-            curr_open = curr_candle["open"]
-            curr_high = curr_candle["high"]
-            curr_low = curr_candle["low"]
-            curr_close = curr_candle["close"]
-
-            # Validate
-            if any(p <= 0 for p in [prev_close, curr_open, curr_high, curr_low, curr_close]):
-                continue
-
-            # Overnight return
-            overnight_ret = math.log(curr_open / prev_close)
-            overnight_returns.append(overnight_ret)
-
-            # Rogers-Satchell component
-            rs = (math.log(curr_high / curr_close) * math.log(curr_high / curr_open) +
-                  math.log(curr_low / curr_close) * math.log(curr_low / curr_open))
-            rs_components.append(rs)
-
-        if len(overnight_returns) < 2 or len(rs_components) < 2:
+        if n < 2:
             return None
 
-        # Calculate variances
-        sigma_o_sq = np.var(overnight_returns, ddof=1)
-        sigma_rs_sq = np.mean(rs_components)
-
         # Yang-Zhang with k=0.34 (optimal for daily data)
         k = 0.34
         sigma_yz_sq = sigma_o_sq + k * sigma_rs_sq
 
-        vol = math.sqrt(abs(sigma_yz_sq))
-
-        # Annualize if requested
-        if self.annualize:
-            vol *= math.sqrt(self.BLOCKS_PER_YEAR / len(overnight_returns))
-
-        return vol
+        return self._to_vol(abs(sigma_yz_sq), n)
 
     def estimate(self) -> Optional[VolatilityResult]:
         """
@@ -289,12 +388,13 @@ class VolatilityEstimator:
         Returns:
             VolatilityResult with all estimators
         """
-        if len(self.candles) < self.min_periods:
+        if self._n < self.min_periods:
             return None
 
-        realized = self.realized_volatility()
-        parkinson = self.parkinson_volatility()
-        garman_klass = self.garman_klass_volatility()
+        # O(1): all three estimators come from the running sums
+        realized = self._realized_from(self._rv_sum, self._rv_sq_sum, self._rv_n)
+        parkinson = self._parkinson_from(self._park_sum, self._park_n)
+        garman_klass = self._garman_klass_from(self._gk_sum, self._gk_n)
 
         # Choose recommended (prefer Garman-Klass if available)
         if garman_klass is not None:
@@ -310,7 +410,7 @@ class VolatilityEstimator:
             return None
 
         # Adjust confidence based on number of periods
-        confidence *= min(len(self.candles) / self.window_periods, 1.0)
+        confidence *= min(self._n / self.window_periods, 1.0)
 
         return VolatilityResult(
             realized_vol=realized or 0.0,
@@ -318,7 +418,7 @@ class VolatilityEstimator:
             garman_klass_vol=garman_klass or 0.0,
             recommended_vol=recommended,
             confidence=confidence,
-            num_periods=len(self.candles),
+            num_periods=self._n,
             annualized=self.annualize
         )
 
@@ -336,52 +436,25 @@ class VolatilityEstimator:
         if not tick_snapshots:
             return None
 
-        # Group snapshots into candles
-        candles = []
-        current_candle = None
-        start_block = tick_snapshots[0]["block"]
-
-        for snapshot in tick_snapshots:
-            block = snapshot["block"]
-            price = snapshot["current_price"]
-
-            # Determine which candle this belongs to
-            candle_index = (block - start_block) // period_blocks
-
-            # Start new candle if needed
-            if current_candle is None or current_candle["index"] != candle_index:
-                if current_candle is not None:
-                    # Close previous candle
-                    candles.append(current_candle)
-
-                # Start new candle
-                current_candle = {
-                    "index": candle_index,
-                    "open": price,
-                    "high": price,
-                    "low": price,
-                    "close": price,
-                    "timestamp": snapshot["timestamp"]
-                }
-            else:
-                # Update current candle
-                current_candle["high"] = max(current_candle["high"], price)
-                current_candle["low"] = min(current_candle["low"], price)
-                current_candle["close"] = price
-
-        # Add final candle
-        if current_candle is not None:
-            candles.append(current_candle)
-
-        # Add candles to estimator
-        for candle in candles:
-            self.add_candle(
-                candle["open"],
-                candle["high"],
-                candle["low"],
-                candle["close"],
-                candle.get("timestamp")
-            )
+        count = len(tick_snapshots)
+        blocks = np.fromiter((snapshot["block"] for snapshot in tick_snapshots),
+                             dtype=np.int64, count=count)
+        prices = np.fromiter((snapshot["current_price"] for snapshot in tick_snapshots),
+                             dtype=np.float64, count=count)
+
+        # Group snapshots into candles: a new candle starts wherever the
+        # period index changes
+        candle_index = (blocks - blocks[0]) // period_blocks
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(candle_index)) + 1))
+        ends = np.append(starts[1:] - 1, count - 1)
+
+        # Add candles to estimator in one ring-buffer write
+        self.add_candles_bulk(
+            prices[starts],
+            np.maximum.reduceat(prices, starts),
+            np.minimum.reduceat(prices, starts),
+            prices[ends]
+        )
 
         return self.estimate()
 
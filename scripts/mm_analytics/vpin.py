@@ -11,12 +11,38 @@ Reference: Easley, López de Prado, O'Hara (2012)
 """
 
 import numpy as np
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from collections import deque
 from dataclasses import dataclass
+from bisect import bisect_right
 
+from ._kernels import bucket_ends, summary_stats
+from .enums import Toxicity
 
-@dataclass
+
+# Trade direction codes returned by classify_trade (same values as the
+# avellaneda_stoikov BUY / SELL sides)
+BUY = 1
+NEUTRAL = 0
+SELL = -1
+_DIRECTION_LABELS = ("sell", "neutral", "buy")  # indexed by code + 1
+
+# Toxicity: VPIN at or above each threshold steps up one level (SAFE → HIGH)
+_TOXICITY_THRESHOLDS = (0.3, 0.5, 0.7)
+_TOXICITY_LEVELS = (Toxicity.SAFE, Toxicity.NORMAL, Toxicity.ELEVATED, Toxicity.HIGH)
+
+# Spread recommendation per level; ELEVATED depends on the imbalance side
+_TOXICITY_RECOMMENDATIONS = (
+    "tighten_spreads", "standard_spreads", None, "pause_quoting_or_widen_significantly"
+)
+_ELEVATED_RECOMMENDATIONS = ("widen_spreads_sell_side", "widen_spreads_buy_side")
+_BATCH_RECOMMENDATIONS = np.array([
+    "tighten_spreads", "standard_spreads", *_ELEVATED_RECOMMENDATIONS,
+    "pause_quoting_or_widen_significantly"
+])
+
+
+@dataclass(slots=True, frozen=True)
 class VPINResult:
     """VPIN calculation result"""
     vpin: float  # Main VPIN metric (0-1)
@@ -27,6 +53,7 @@ class VPINResult:
     imbalance: float  # |buy - sell| / total
     recommendation: str  # Spread adjustment recommendation
     confidence: float  # Confidence in the signal (0-1)
+    toxicity_id: Toxicity = Toxicity.UNKNOWN  # Enum form of toxicity_level
 
 
 class VPINCalculator:
@@ -40,6 +67,26 @@ class VPINCalculator:
     - VPIN > 0.7: High toxicity, widen significantly or pause
     """
 
+    __slots__ = (
+        "bucket_size", "num_buckets", "price_change_threshold",
+        "_buy", "_sell", "_total", "_head", "_n", "_vpin",
+        "_imb_sum", "_buy_sum", "_sell_sum", "_total_sum",
+        "_cur_buy", "_cur_sell", "_cur_total", "last_price", "_volume_divisor",
+    )
+
+    # Returned by calculate_vpin until the window is full; shared, so it is
+    # frozen like every VPINResult
+    _INSUFFICIENT = VPINResult(
+        vpin=0.0,
+        toxicity_level="unknown",
+        buy_volume=0.0,
+        sell_volume=0.0,
+        total_volume=0.0,
+        imbalance=0.0,
+        recommendation="insufficient_data",
+        confidence=0.0
+    )
+
     def __init__(
         self,
         bucket_size: float = 50.0,  # Volume per bucket (e.g., 50 ETH)
@@ -58,17 +105,95 @@ class VPINCalculator:
         self.num_buckets = num_buckets
         self.price_change_threshold = price_change_threshold
 
-        # State
-        self.buckets = deque(maxlen=num_buckets)
-        self.current_bucket = {"buy_volume": 0.0, "sell_volume": 0.0, "total_volume": 0.0}
+        # State: closed buckets as ring buffers, one contiguous array per
+        # field (head = next write slot). Bucket volumes only need ~7
+        # significant digits, so they are stored as float32; the running
+        # sums and VPIN history stay float64.
+        self._buy = np.zeros(num_buckets, dtype=np.float32)
+        self._sell = np.zeros(num_buckets, dtype=np.float32)
+        self._total = np.zeros(num_buckets, dtype=np.float32)
+        self._head = 0
+        self._n = 0
+
+        # VPIN of the window ending at each bucket, NaN until the window was full
+        self._vpin = np.full(num_buckets, np.nan)
+
+        # Running sums over the window, so calculate_vpin() is O(1).
+        # Re-derived from the ring buffers once per wrap.
+        self._imb_sum = 0.0
+        self._buy_sum = 0.0
+        self._sell_sum = 0.0
+        self._total_sum = 0.0
+
+        # Volumes of the bucket being filled
+        self._cur_buy = 0.0
+        self._cur_sell = 0.0
+        self._cur_total = 0.0
         self.last_price = None
 
+        # 10**decimals0 of the pair's swaps, resolved on the first swap event
+        self._volume_divisor: Optional[int] = None
+
+    def _ordered(self, buf: np.ndarray) -> np.ndarray:
+        """Window of a ring buffer, oldest first (a view until the buffer wraps)"""
+        if self._n < self.num_buckets:
+            return buf[:self._n]
+        return np.concatenate((buf[self._head:], buf[:self._head]))
+
+    def _recent(self, buf: np.ndarray, k: int) -> np.ndarray:
+        """
+        The k newest entries of a ring buffer, oldest first
+
+        A view unless the range crosses the wrap point, in which case the two
+        pieces are concatenated. Caller ensures k <= number of closed buckets.
+        """
+        end = (self._head - 1) % self.num_buckets + 1
+        start = end - k
+        if start >= 0:
+            return buf[start:end]
+        return np.concatenate((buf[start:], buf[:end]))
+
+    def _view(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Buy, sell and total volume arrays of the closed buckets, oldest first"""
+        return self._ordered(self._buy), self._ordered(self._sell), self._ordered(self._total)
+
+    def _resync(self):
+        """Re-derive the running sums from the ring buffers (bounds float drift)"""
+        buy = self._buy.astype(np.float64)
+        sell = self._sell.astype(np.float64)
+        self._imb_sum = float(np.abs(buy - sell).sum())
+        self._buy_sum = float(buy.sum())
+        self._sell_sum = float(sell.sum())
+        self._total_sum = float(self._total.sum(dtype=np.float64))
+
+    @property
+    def current_bucket(self) -> Dict:
+        """Volumes of the bucket being filled"""
+        return {
+            "buy_volume": self._cur_buy,
+            "sell_volume": self._cur_sell,
+            "total_volume": self._cur_total
+        }
+
+    @property
+    def buckets(self) -> List[Dict]:
+        """Closed buckets in the window as dicts, oldest first"""
+        buy, sell, total = self._view()
+        return [
+            {
+                "buy_volume": float(buy[i]),
+                "sell_volume": float(sell[i]),
+                "total_volume": float(total[i])
+            }
+            for i in range(self._n)
+        ]
+
     def classify_trade(
         self,
         price: float,
         volume: float,
         prev_price: Optional[float] = None
-    ) -> str:
+    ) -> int:
         """
         Classify trade as buy or sell using price change (bulk volume classification)
 
@@ -78,20 +203,29 @@ class VPINCalculator:
             prev_price: Previous trade price (or mid-price)
 
         Returns:
-            "buy" or "sell"
+            BUY (1), SELL (-1) or NEUTRAL (0)
         """
         if prev_price is None:
             # First trade, default to neutral (split 50/50)
-            return "neutral"
+            return NEUTRAL
 
         price_change = price - prev_price
 
         if abs(price_change) < self.price_change_threshold:
-            return "neutral"
+            return NEUTRAL
         elif price_change > 0:
-            return "buy"  # Price moved up = buyer-initiated
+            return BUY  # Price moved up = buyer-initiated
         else:
-            return "sell"  # Price moved down = seller-initiated
+            return SELL  # Price moved down = seller-initiated
+
+    def classify_trade_str(
+        self,
+        price: float,
+        volume: float,
+        prev_price: Optional[float] = None
+    ) -> str:
+        """Same as classify_trade, as a string: "buy", "sell" or "neutral" """
+        return _DIRECTION_LABELS[self.classify_trade(price, volume, prev_price) + 1]
 
     def add_trade(self, price: float, volume: float) -> Optional[VPINResult]:
         """
@@ -104,37 +238,141 @@ class VPINCalculator:
         Returns:
             VPINResult if a bucket completed, otherwise None
         """
-        # Classify trade direction
-        trade_type = self.classify_trade(price, volume, self.last_price)
-
-        # Add to current bucket
-        if trade_type == "buy":
-            self.current_bucket["buy_volume"] += volume
-        elif trade_type == "sell":
-            self.current_bucket["sell_volume"] += volume
-        else:  # neutral
-            # Split volume 50/50
-            self.current_bucket["buy_volume"] += volume / 2
-            self.current_bucket["sell_volume"] += volume / 2
+        # Classify trade direction and add to current bucket (classify_trade
+        # inlined; the abs() test is skipped for the default zero threshold,
+        # where it can never be true)
+        last_price = self.last_price
+        threshold = self.price_change_threshold
+        price_change = 0.0 if last_price is None else price - last_price
+        if last_price is None or (threshold and abs(price_change) < threshold):
+            # Neutral: split volume 50/50
+            half = volume / 2
+            self._cur_buy += half
+            self._cur_sell += half
+        elif price_change > 0:
+            self._cur_buy += volume
+        else:
+            self._cur_sell += volume
 
-        self.current_bucket["total_volume"] += volume
+        self._cur_total += volume
 
         self.last_price = price
 
         # Check if bucket is full
-        if self.current_bucket["total_volume"] >= self.bucket_size:
-            # Close current bucket
-            self.buckets.append(dict(self.current_bucket))
+        if self._cur_total >= self.bucket_size:
+            self._close_bucket(self._cur_buy, self._cur_sell, self._cur_total)
 
             # Reset current bucket
-            self.current_bucket = {"buy_volume": 0.0, "sell_volume": 0.0, "total_volume": 0.0}
+            self._cur_buy = 0.0
+            self._cur_sell = 0.0
+            self._cur_total = 0.0
 
             # Calculate VPIN if we have enough buckets
-            if len(self.buckets) >= self.num_buckets:
+            if self._n >= self.num_buckets:
                 return self.calculate_vpin()
 
         return None
 
+    def add_trades(self, prices, volumes) -> List[VPINResult]:
+        """
+        Add a batch of trades, oldest first (e.g. historical backfill)
+
+        Same buckets and results as calling add_trade on each trade in order:
+        trade directions are classified with array ops and bucket boundaries
+        come from the bucket_ends kernel, so Python only loops per bucket.
+
+        Args:
+            prices: Array-like of trade prices
+            volumes: Array-like of trade volumes (in base token, non-negative)
+
+        Returns:
+            VPINResult for each bucket that completed a full window, in order
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = np.asarray(volumes, dtype=np.float64)
+        n = prices.shape[0]
+        if n == 0:
+            return []
+
+        # Price change vs the previous trade (NaN for the very first trade)
+        prev = np.empty(n)
+        prev[0] = np.nan if self.last_price is None else self.last_price
+        prev[1:] = prices[:-1]
+        price_change = prices - prev
+
+        # Direction per trade, same rules and codes as classify_trade: BUY,
+        # SELL or NEUTRAL (NaN compares False, so the first trade is neutral)
+        classified = (np.abs(price_change) >= self.price_change_threshold).astype(np.int8)
+        direction = classified * (2 * (price_change > 0).astype(np.int8) - 1)
+
+        # Buy share 1, 0.5 (neutral split) or 0; the rest is sell volume
+        buy_vols = volumes * ((direction + 1) * 0.5)
+        sell_vols = volumes - buy_vols
+
+        # Where each bucket closes (same trade order as add_trade)
+        ends, totals, open_total = bucket_ends(volumes, self._cur_total, self.bucket_size)
+        totals = totals.tolist()
+
+        # Buy/sell volume per closed bucket, then per trailing open bucket
+        starts = [0] + (ends + 1).tolist()
+        if starts[-1] == n:
+            starts.pop()
+        seg_buy = np.add.reduceat(buy_vols, starts).tolist()
+        seg_sell = np.add.reduceat(sell_vols, starts).tolist()
+
+        results = []
+        for i, total in enumerate(totals):
+            self._close_bucket(self._cur_buy + seg_buy[i], self._cur_sell + seg_sell[i], total)
+            self._cur_buy = 0.0
+            self._cur_sell = 0.0
+            if self._n >= self.num_buckets:
+                results.append(self.calculate_vpin())
+
+        if len(seg_buy) > len(totals):
+            self._cur_buy += seg_buy[-1]
+            self._cur_sell += seg_sell[-1]
+        self._cur_total = open_total
+
+        self.last_price = float(prices[-1])
+        return results
+
+    def _close_bucket(self, buy_vol: float, sell_vol: float, total_vol: float):
+        """
+        Append a closed bucket to the ring buffers
+
+        The evicted bucket (zeros while the window fills) is swapped out of
+        the running sums. Volumes are rounded to the stored float32 first so
+        what is added to the sums is exactly what is later subtracted.
+        """
+        head = self._head
+        buy_vol = float(np.float32(buy_vol))
+        sell_vol = float(np.float32(sell_vol))
+        total_vol = float(np.float32(total_vol))
+        old_buy = float(self._buy[head])
+        old_sell = float(self._sell[head])
+        self._imb_sum += abs(buy_vol - sell_vol) - abs(old_buy - old_sell)
+        self._buy_sum += buy_vol - old_buy
+        self._sell_sum += sell_vol - old_sell
+        self._total_sum += total_vol - float(self._total[head])
+        self._buy[head] = buy_vol
+        self._sell[head] = sell_vol
+        self._total[head] = total_vol
+        size = self.num_buckets
+        if self._n < size:
+            self._n += 1
+        if self._n == size and self._total_sum > 0:
+            self._vpin[head] = self._imb_sum / self._total_sum
+        else:
+            self._vpin[head] = np.nan
+
+        # Advance the head with a compare instead of a modulo; the wrap is
+        # also where the running sums are re-synced
+        head += 1
+        if head == size:
+            head = 0
+            self._resync()
+        self._head = head
+
     def add_swap_event(self, swap_event) -> Optional[VPINResult]:
         """
         Convenience method to add a SwapEvent
@@ -145,8 +383,12 @@ class VPINCalculator:
         Returns:
             VPINResult if bucket completed
         """
-        # Extract volume (use absolute value of amount0)
-        volume = abs(swap_event.amount0) / (10 ** swap_event.metadata.get("decimals0", 18))
+        # Extract volume (use absolute value of amount0); token decimals are
+        # fixed per pair, so the divisor is computed once
+        divisor = self._volume_divisor
+        if divisor is None:
+            divisor = self._volume_divisor = 10 ** swap_event.metadata.get("decimals0", 18)
+        volume = abs(swap_event.amount0) / divisor
         return self.add_trade(swap_event.price, volume)
 
     def calculate_vpin(self) -> VPINResult:
@@ -158,34 +400,15 @@ class VPINCalculator:
         Returns:
             VPINResult with toxicity assessment
         """
-        if len(self.buckets) < self.num_buckets:
+        if self._n < self.num_buckets:
             # Not enough data
-            return VPINResult(
-                vpin=0.0,
-                toxicity_level="unknown",
-                buy_volume=0.0,
-                sell_volume=0.0,
-                total_volume=0.0,
-                imbalance=0.0,
-                recommendation="insufficient_data",
-                confidence=0.0
-            )
-
-        # Calculate total imbalance and volume
-        total_imbalance = 0.0
-        total_volume = 0.0
-        total_buy = 0.0
-        total_sell = 0.0
-
-        for bucket in self.buckets:
-            buy_vol = bucket["buy_volume"]
-            sell_vol = bucket["sell_volume"]
-            imbalance = abs(buy_vol - sell_vol)
-
-            total_imbalance += imbalance
-            total_volume += bucket["total_volume"]
-            total_buy += buy_vol
-            total_sell += sell_vol
+            return self._INSUFFICIENT
+
+        # Total imbalance and volume over the window, from the running sums
+        total_imbalance = self._imb_sum
+        total_volume = self._total_sum
+        total_buy = self._buy_sum
+        total_sell = self._sell_sum
 
         # Calculate VPIN
         vpin = total_imbalance / total_volume if total_volume > 0 else 0.0
@@ -194,17 +417,18 @@ class VPINCalculator:
         imbalance_ratio = (total_buy - total_sell) / total_volume if total_volume > 0 else 0.0
 
         # Determine toxicity level and recommendation
-        toxicity_level, recommendation, confidence = self._assess_toxicity(vpin, imbalance_ratio)
+        toxicity, recommendation, confidence = self._assess_toxicity(vpin, imbalance_ratio)
 
         return VPINResult(
             vpin=vpin,
-            toxicity_level=toxicity_level,
+            toxicity_level=toxicity.label,
             buy_volume=total_buy,
             sell_volume=total_sell,
             total_volume=total_volume,
             imbalance=imbalance_ratio,
             recommendation=recommendation,
-            confidence=confidence
+            confidence=confidence,
+            toxicity_id=toxicity
         )
 
     def _assess_toxicity(
@@ -216,76 +440,79 @@ class VPINCalculator:
         Assess toxicity level and generate spread recommendation
 
         Returns:
-            (toxicity_level, recommendation, confidence)
+            (Toxicity, recommendation, confidence)
         """
         # Confidence based on how extreme VPIN is
         confidence = min(abs(vpin - 0.4) * 2, 1.0)  # Most confident at extremes
 
-        if vpin < 0.3:
-            return (
-                "safe",
-                "tighten_spreads",
-                confidence
-            )
-        elif vpin < 0.5:
-            return (
-                "normal",
-                "standard_spreads",
-                confidence
-            )
-        elif vpin < 0.7:
-            return (
-                "elevated",
-                f"widen_spreads_{'buy' if imbalance_ratio > 0 else 'sell'}_side",
-                confidence
-            )
+        level = bisect_right(_TOXICITY_THRESHOLDS, vpin)
+        if level == Toxicity.ELEVATED:
+            recommendation = _ELEVATED_RECOMMENDATIONS[int(imbalance_ratio > 0)]
         else:
-            return (
-                "high",
-                "pause_quoting_or_widen_significantly",
-                confidence
-            )
+            recommendation = _TOXICITY_RECOMMENDATIONS[level]
+        return (_TOXICITY_LEVELS[level], recommendation, confidence)
 
-    def get_recent_vpin_stats(self, lookback: int = 10) -> Dict:
+    def assess_toxicity_batch(self, vpins, imbalance_ratios) -> Dict[str, np.ndarray]:
         """
-        Get statistics over recent VPIN calculations
+        Vectorized _assess_toxicity for historical VPIN series (backtests, plots)
+        Inputs may be scalars or arrays and broadcast against each other
 
         Args:
-            lookback: Number of recent buckets to analyze
+            vpins: VPIN value(s)
+            imbalance_ratios: Signed buy/sell imbalance ratio(s)
 
         Returns:
-            Dictionary with statistics
+            Dictionary of arrays: "toxicity" (Toxicity values), "recommendation",
+            "confidence"
         """
-        if len(self.buckets) < lookback:
-            lookback = len(self.buckets)
+        vpin = np.asarray(vpins, dtype=np.float64)
+        imbalance = np.asarray(imbalance_ratios, dtype=np.float64)
 
-        if lookback == 0:
-            return {"error": "no_data"}
+        level = np.searchsorted(_TOXICITY_THRESHOLDS, vpin, side="right")
+        # Index into _BATCH_RECOMMENDATIONS: ELEVATED takes two slots (sell, buy)
+        rec_index = level + (level > Toxicity.ELEVATED) + ((level == Toxicity.ELEVATED) & (imbalance > 0))
+        level, rec_index = np.broadcast_arrays(level, rec_index)
 
-        recent_buckets = list(self.buckets)[-lookback:]
+        return {
+            "toxicity": level.astype(np.int8),
+            "recommendation": _BATCH_RECOMMENDATIONS[rec_index],
+            "confidence": np.broadcast_to(np.minimum(np.abs(vpin - 0.4) * 2, 1.0), level.shape)
+        }
 
-        vpins = []
-        for i in range(len(recent_buckets)):
-            if i < self.num_buckets:
-                continue
+    def get_recent_vpin_stats(self, lookback: int = 10) -> Dict:
+        """
+        Get statistics over recent VPIN calculations
 
-            window = recent_buckets[max(0, i - self.num_buckets):i]
-            total_imbalance = sum(abs(b["buy_volume"] - b["sell_volume"]) for b in window)
-            total_volume = sum(b["total_volume"] for b in window)
+        Args:
+            lookback: Number of recent bucket closes to analyze (at most num_buckets)
 
-            if total_volume > 0:
-                vpins.append(total_imbalance / total_volume)
+        Returns:
+            Dictionary with statistics
+        """
+        lookback = min(lookback, self._n)
+        if lookback <= 0:
+            return {"error": "no_data"}
 
-        if not vpins:
+        # VPIN of each full window that ended at one of the last `lookback`
+        # bucket closes (NaN where the window wasn't full yet)
+        vpins = self._recent(self._vpin, lookback)
+        vpins = vpins[~np.isnan(vpins)]
+        if vpins.size == 0:
             return {"error": "insufficient_data"}
 
+        # Trend from the sign of the least-squares slope over the closes
+        t = np.arange(vpins.size) - (vpins.size - 1) / 2
+        slope = float(t @ vpins)
+
+        mean_vpin, std_vpin, min_vpin, max_vpin = summary_stats(vpins)
+
         return {
-            "mean_vpin": np.mean(vpins),
-            "std_vpin": np.std(vpins),
-            "min_vpin": np.min(vpins),
-            "max_vpin": np.max(vpins),
-            "current_vpin": vpins[-1] if vpins else 0.0,
-            "trend": "increasing" if len(vpins) > 1 and vpins[-1] > vpins[0] else "decreasing"
+            "mean_vpin": mean_vpin,
+            "std_vpin": std_vpin,
+            "min_vpin": min_vpin,
+            "max_vpin": max_vpin,
+            "current_vpin": float(vpins[-1]),
+            "trend": "increasing" if slope > 0 else "decreasing"
         }
 
 
@@ -295,15 +522,16 @@ class VPINMonitor:
     Tracks multiple pairs and sends alerts
     """
 
-    def __init__(self, pairs: Dict[str, VPINCalculator]):
+    def __init__(self, pairs: Dict[str, VPINCalculator], max_alerts: int = 10_000):
         """
         Initialize VPIN monitor
 
         Args:
             pairs: Dictionary of {pair_symbol: VPINCalculator}
+            max_alerts: Alerts kept until get_alerts collects them (oldest dropped first)
         """
         self.pairs = pairs
-        self.alerts = []
+        self.alerts = deque(maxlen=max_alerts)
 
     def process_swap(self, pair: str, swap_event) -> Optional[VPINResult]:
         """
@@ -316,14 +544,14 @@ class VPINMonitor:
         Returns:
             VPINResult if bucket completed
         """
-        if pair not in self.pairs:
+        calculator = self.pairs.get(pair)
+        if calculator is None:
             raise ValueError(f"Unknown pair: {pair}")
 
-        calculator = self.pairs[pair]
         result = calculator.add_swap_event(swap_event)
 
         # Check for alerts
-        if result and result.toxicity_level in ["elevated", "high"]:
+        if result and result.toxicity_id in (Toxicity.ELEVATED, Toxicity.HIGH):
             self.alerts.append({
                 "pair": pair,
                 "timestamp": swap_event.timestamp,
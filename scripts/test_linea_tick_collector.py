@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the tick collector's on-disk delta stream
+
+Run from scripts/ (skipped when web3 / aiohttp are not installed):
+    python3 -m unittest discover
+"""
+
+import asyncio
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+try:
+    from linea_tick_collector import LynexTickCollector, SNAPSHOT_FORMATS, load_snapshots
+except ImportError as exc:  # web3 / aiohttp not installed
+    raise unittest.SkipTest(f"linea_tick_collector unavailable: {exc}")
+
+
+class _OfflineCollector(LynexTickCollector):
+    """Collector over an in-memory pool: same snapshot code path, no RPC"""
+
+    def __init__(self, data_dir: str, seed: int = 0):
+        self.pool_address = "0x0000000000000000000000000000000000000001"
+        self.tick_range = 10
+        self.data_dir = Path(data_dir)
+        self.w3 = SimpleNamespace(eth=SimpleNamespace(block_number=1_000_000))
+
+        self.token0 = "0x00000000000000000000000000000000000000a0"
+        self.token1 = "0x00000000000000000000000000000000000000b0"
+        self.fee = 3000
+        self.tick_spacing = 60
+        self.decimals0 = 18
+        self.decimals1 = 6
+
+        self.last_block = None
+        self.last_tick = None
+        self.last_liquidity = None
+        self.snapshots = []
+
+        self.rng = random.Random(seed)
+        self.ticks = {}  # tick -> (liquidityGross, liquidityNet)
+        self.tick = 0
+        self.sqrt_price = 2 ** 96
+
+    def step(self):
+        """Advance one block: a few Mint/Burn updates and a Swap"""
+        self.w3.eth.block_number += 1
+        for _ in range(3):
+            tick = self.rng.randrange(-8, 9) * self.tick_spacing
+            if tick in self.ticks and self.rng.random() < 0.4:
+                del self.ticks[tick]
+            else:
+                self.ticks[tick] = (self.rng.randrange(1, 10 ** 24), self.rng.randrange(-10 ** 24, 10 ** 24))
+        self.tick += self.rng.choice((-60, 0, 0, 60))
+        self.sqrt_price = self.rng.randrange(2 ** 95, 2 ** 97)
+
+    def get_slot0(self):
+        return {"sqrtPriceX96": self.sqrt_price, "tick": self.tick}
+
+    def get_liquidity(self):
+        return 10 ** 20 + self.w3.eth.block_number
+
+    def get_tick_data(self, tick):
+        gross, net = self.ticks.get(tick, (0, 0))
+        return {"tick": tick, "liquidityGross": gross, "liquidityNet": net, "initialized": gross > 0}
+
+
+class SnapshotRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.collector = _OfflineCollector(self.tmp.name)
+        for _ in range(30):
+            self.collector.step()
+            asyncio.run(self.collector.capture_snapshot())
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_save_load_round_trip(self):
+        for fmt, ext in SNAPSHOT_FORMATS.items():
+            with self.subTest(fmt=fmt):
+                try:
+                    filepath = self.collector.save_snapshots(f"roundtrip_{fmt}", fmt=fmt)
+                except ImportError as exc:  # pyarrow / msgpack are optional
+                    self.skipTest(f"{fmt} writer unavailable: {exc}")
+                self.assertEqual(filepath.suffix, ext)
+                data = load_snapshots(str(filepath))
+                self.assertEqual(data["snapshot_count"], len(self.collector.snapshots))
+                self.assertEqual(data["snapshots"], self.collector.snapshots)
+
+
+if __name__ == "__main__":
+    unittest.main()